@@ -3,11 +3,62 @@
 负责水印模板的保存、加载和管理
 """
 
+import copy
 import json
 import os
 from pathlib import Path
-from typing import Dict, List, Optional, Any
-from datetime import datetime
+from types import MappingProxyType
+from typing import Dict, List, Optional, Any, Union
+from datetime import date, datetime
+
+try:
+    import orjson
+except ImportError:  # orjson为可选依赖，缺失时回退到标准库json
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # msgpack为可选依赖，缺失时设置文件继续使用JSON
+    msgpack = None
+
+
+def dumps_json(obj: Any) -> bytes:
+    """序列化为带缩进的UTF-8 JSON字节串"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, ensure_ascii=False, indent=2).encode('utf-8')
+
+
+def loads_json(data: Union[bytes, str]) -> Any:
+    """解析JSON数据（接受UTF-8字节串，orjson直接解析，无需先解码为str）"""
+    if orjson is not None:
+        return orjson.loads(data)
+    if isinstance(data, bytes):
+        data = data.decode('utf-8')
+    return json.loads(data)
+
+
+_today_cache = (None, None)  # (日期, 格式化后的日期文本)
+
+
+def _today_text() -> str:
+    """当天日期文本（YYYY-MM-DD），同一天内只格式化一次"""
+    global _today_cache
+    today = date.today()
+    if _today_cache[0] != today:
+        _today_cache = (today, today.strftime("%Y-%m-%d"))
+    return _today_cache[1]
+
+
+def atomic_write(path: Union[str, Path], data: bytes):
+    """先写入临时文件再替换目标文件，避免写入中断导致文件损坏"""
+    path = Path(path)
+    tmp_path = path.with_suffix(path.suffix + '.tmp')
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
 
 
 class ConfigManager:
@@ -20,12 +71,18 @@ class ConfigManager:
         # 配置文件路径
         self.templates_file = self.config_dir / "templates.json"
         self.settings_file = self.config_dir / "settings.json"
+        self.settings_binary_file = self.config_dir / "settings.msgpack"
+        
+        # 内存缓存（按文件修改时间失效）
+        self._templates_cache = None
+        self._templates_mtime = 0
+        self._settings_cache = None
+        self._settings_mtime = 0
         
-        # 默认配置
-        current_date = datetime.now().strftime("%Y-%m-%d")
-        self.default_watermark_config = {
+        # 默认配置（只读视图；text为None，在new_watermark_config中按需填入当天日期）
+        self._default_watermark_config = {
             'type': 'text',
-            'text': current_date,
+            'text': None,
             'font_name': None,
             'font_size': 36,  # 这个会被自动计算覆盖
             'color': [0, 0, 0, 128],  # RGBA - 黑色半透明
@@ -43,8 +100,9 @@ class ConfigManager:
             'scale_percent': 100.0,
             'image_path': None
         }
+        self.default_watermark_config = MappingProxyType(self._default_watermark_config)
         
-        self.default_export_config = {
+        self._default_export_config = {
             'output_format': 'JPEG',
             'quality': 95,
             'naming_rule': 'suffix',
@@ -54,6 +112,7 @@ class ConfigManager:
             'resize_height': None,
             'resize_scale': None
         }
+        self.default_export_config = MappingProxyType(self._default_export_config)
         
         # 初始化配置文件
         self._init_config_files()
@@ -68,16 +127,16 @@ class ConfigManager:
                         'name': 'Default',
                         'description': '默认水印模板',
                         'created_time': datetime.now().isoformat(),
-                        'watermark_config': self.default_watermark_config.copy(),
-                        'export_config': self.default_export_config.copy()
+                        'watermark_config': self.new_watermark_config(),
+                        'export_config': self.get_default_export_config()
                     }
                 },
                 'last_used': 'Default'
             }
             self.save_templates(default_templates)
         
-        # 初始化设置文件
-        if not self.settings_file.exists():
+        # 初始化设置文件（已有旧JSON设置时由load_settings迁移）
+        if not self._settings_path().exists() and not self.settings_file.exists():
             default_settings = {
                 'window_size': [1200, 800],
                 'window_position': None,
@@ -89,11 +148,27 @@ class ConfigManager:
             }
             self.save_settings(default_settings)
     
+    @staticmethod
+    def _get_mtime(path: Path) -> int:
+        """获取文件修改时间（纳秒），文件不存在时返回0"""
+        try:
+            return os.stat(path).st_mtime_ns
+        except OSError:
+            return 0
+    
+    def _cached_templates(self) -> Dict[str, Any]:
+        """读取模板缓存（文件未修改时直接返回缓存本身，调用方不得修改）"""
+        mtime = self._get_mtime(self.templates_file)
+        if self._templates_cache is None or mtime != self._templates_mtime:
+            with open(self.templates_file, 'rb') as f:
+                self._templates_cache = loads_json(f.read())
+            self._templates_mtime = mtime
+        return self._templates_cache
+    
     def load_templates(self) -> Dict[str, Any]:
-        """加载所有模板"""
+        """加载所有模板（返回缓存的副本，修改返回值不会影响缓存）"""
         try:
-            with open(self.templates_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            return copy.deepcopy(self._cached_templates())
         except Exception as e:
             print(f"加载模板失败: {str(e)}")
             return {'templates': {}, 'last_used': None}
@@ -101,17 +176,25 @@ class ConfigManager:
     def save_templates(self, templates_data: Dict[str, Any]) -> bool:
         """保存所有模板"""
         try:
-            with open(self.templates_file, 'w', encoding='utf-8') as f:
-                json.dump(templates_data, f, ensure_ascii=False, indent=2)
+            atomic_write(self.templates_file, dumps_json(templates_data))
+            
+            # 写入后同步更新缓存（保存副本，调用方之后修改参数不会影响缓存）
+            self._templates_cache = copy.deepcopy(templates_data)
+            self._templates_mtime = self._get_mtime(self.templates_file)
             return True
         except Exception as e:
+            self._templates_cache = None
             print(f"保存模板失败: {str(e)}")
             return False
     
     def get_template(self, template_name: str) -> Optional[Dict[str, Any]]:
-        """获取指定模板"""
-        templates_data = self.load_templates()
-        return templates_data['templates'].get(template_name)
+        """获取指定模板（返回副本）"""
+        try:
+            template = self._cached_templates()['templates'].get(template_name)
+        except Exception as e:
+            print(f"加载模板失败: {str(e)}")
+            return None
+        return copy.deepcopy(template)
     
     def save_template(self, template_name: str, watermark_config: Dict[str, Any], 
                      export_config: Dict[str, Any], description: str = "") -> bool:
@@ -183,11 +266,32 @@ class ConfigManager:
             print(f"设置最后使用模板失败: {str(e)}")
             return False
     
+    def _settings_path(self) -> Path:
+        """设置文件路径（安装了msgpack时使用二进制格式）"""
+        return self.settings_binary_file if msgpack is not None else self.settings_file
+    
     def load_settings(self) -> Dict[str, Any]:
-        """加载应用设置"""
+        """加载应用设置（文件未修改时直接返回缓存）"""
         try:
-            with open(self.settings_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            settings_path = self._settings_path()
+            mtime = self._get_mtime(settings_path)
+            if self._settings_cache is not None and mtime == self._settings_mtime:
+                return copy.deepcopy(self._settings_cache)
+            
+            if mtime == 0 and settings_path != self.settings_file:
+                # 二进制设置文件不存在，从旧的JSON设置文件迁移一次
+                with open(self.settings_file, 'rb') as f:
+                    settings = loads_json(f.read())
+                self.save_settings(settings)
+                return settings
+            
+            with open(settings_path, 'rb') as f:
+                data = f.read()
+            settings = msgpack.unpackb(data, raw=False) if msgpack is not None else loads_json(data)
+            
+            self._settings_cache = copy.deepcopy(settings)
+            self._settings_mtime = mtime
+            return settings
         except Exception as e:
             print(f"加载设置失败: {str(e)}")
             return {}
@@ -195,10 +299,19 @@ class ConfigManager:
     def save_settings(self, settings: Dict[str, Any]) -> bool:
         """保存应用设置"""
         try:
-            with open(self.settings_file, 'w', encoding='utf-8') as f:
-                json.dump(settings, f, ensure_ascii=False, indent=2)
+            settings_path = self._settings_path()
+            if msgpack is not None:
+                data = msgpack.packb(settings, use_bin_type=True)
+            else:
+                data = dumps_json(settings)
+            atomic_write(settings_path, data)
+            
+            # 写入后同步更新缓存（保存副本）
+            self._settings_cache = copy.deepcopy(settings)
+            self._settings_mtime = self._get_mtime(settings_path)
             return True
         except Exception as e:
+            self._settings_cache = None
             print(f"保存设置失败: {str(e)}")
             return False
     
@@ -222,8 +335,7 @@ class ConfigManager:
         try:
             template = self.get_template(template_name)
             if template:
-                with open(export_path, 'w', encoding='utf-8') as f:
-                    json.dump(template, f, ensure_ascii=False, indent=2)
+                atomic_write(export_path, dumps_json(template))
                 return True
             return False
         except Exception as e:
@@ -233,8 +345,8 @@ class ConfigManager:
     def import_template(self, import_path: str, template_name: str = None) -> bool:
         """从文件导入模板"""
         try:
-            with open(import_path, 'r', encoding='utf-8') as f:
-                template_data = json.load(f)
+            with open(import_path, 'rb') as f:
+                template_data = loads_json(f.read())
             
             # 如果没有指定名称，使用文件中的名称或文件名
             if not template_name:
@@ -245,10 +357,12 @@ class ConfigManager:
             export_config = template_data.get('export_config', {})
             description = template_data.get('description', f'从 {import_path} 导入')
             
-            # 填充缺失的配置项
-            for key, value in self.default_watermark_config.items():
-                if key not in watermark_config:
-                    watermark_config[key] = value
+            # 填充缺失的配置项（没有缺失项时无需生成默认配置）
+            missing = self._default_watermark_config.keys() - watermark_config.keys()
+            if missing:
+                defaults = self.new_watermark_config()
+                for key in missing:
+                    watermark_config[key] = defaults[key]
             
             for key, value in self.default_export_config.items():
                 if key not in export_config:
@@ -260,10 +374,20 @@ class ConfigManager:
             print(f"导入模板失败: {str(e)}")
             return False
     
+    def new_watermark_config(self) -> Dict[str, Any]:
+        """创建可修改的默认水印配置（列表值单独复制，避免与默认值共享）"""
+        defaults = self._default_watermark_config
+        return {
+            **defaults,
+            'text': defaults['text'] or _today_text(),
+            'color': list(defaults['color']),
+            'stroke_color': list(defaults['stroke_color'])
+        }
+    
     def get_default_watermark_config(self) -> Dict[str, Any]:
         """获取默认水印配置"""
-        return self.default_watermark_config.copy()
+        return self.new_watermark_config()
     
     def get_default_export_config(self) -> Dict[str, Any]:
         """获取默认导出配置"""
-        return self.default_export_config.copy()
\ No newline at end of file
+        return dict(self._default_export_config)
\ No newline at end of file
@@ -13,7 +13,7 @@ class ImageProcessor:
     """图像处理器"""
     
     # 支持的输入格式
-    SUPPORTED_INPUT_FORMATS = {'.jpg', '.jpeg', '.png', '.bmp', '.tiff', '.tif'}
+    SUPPORTED_INPUT_FORMATS = frozenset({'.jpg', '.jpeg', '.png', '.bmp', '.tiff', '.tif'})
     # 支持的输出格式
     SUPPORTED_OUTPUT_FORMATS = {'JPEG', 'PNG'}
     
@@ -22,8 +22,9 @@ class ImageProcessor:
         
     def is_supported_format(self, file_path: str) -> bool:
         """检查文件格式是否支持"""
-        ext = Path(file_path).suffix.lower()
-        return ext in self.SUPPORTED_INPUT_FORMATS
+        # 直接切取扩展名，避免为每个文件构造Path对象
+        i = file_path.rfind('.')
+        return i >= 0 and file_path[i:].lower() in self.SUPPORTED_INPUT_FORMATS
     
     def load_image(self, file_path: str) -> Optional[dict]:
         """
@@ -34,33 +35,39 @@ class ImageProcessor:
             if not self.is_supported_format(file_path):
                 raise ValueError(f"不支持的文件格式: {file_path}")
             
-            # 打开图片
-            image = Image.open(file_path)
-            
-            # 如果是RGBA模式但保存为JPEG，需要转换
-            if image.mode == 'RGBA':
-                # 保持RGBA模式以支持透明度
-                pass
-            elif image.mode not in ('RGB', 'RGBA', 'L'):
-                # 转换为RGB模式
-                image = image.convert('RGB')
-            
-            # 创建图片信息字典
-            image_info = {
-                'path': file_path,
-                'name': Path(file_path).name,
-                'image': image,
-                'size': image.size,
-                'mode': image.mode,
-                'format': image.format
-            }
-            
-            return image_info
+            # 打开图片（只读取文件头，不解码像素数据），读取出错时文件同样会被关闭
+            with Image.open(file_path) as image:
+                # 非RGB/RGBA/L模式在解码时会转换为RGB
+                mode = image.mode if image.mode in ('RGB', 'RGBA', 'L') else 'RGB'
+                
+                # 创建图片信息字典，像素数据由get_image按需加载
+                return {
+                    'path': file_path,
+                    'name': os.path.basename(file_path),
+                    'size': image.size,
+                    'mode': mode,
+                    'format': image.format
+                }
             
         except Exception as e:
             print(f"加载图片失败 {file_path}: {str(e)}")
             return None
     
+    def get_image(self, image_info: dict) -> Image.Image:
+        """
+        获取图片对象，首次访问时才解码像素数据
+        """
+        image = image_info.get('image')
+        if image is None:
+            image = Image.open(image_info['path'])
+            
+            if image.mode not in ('RGB', 'RGBA', 'L'):
+                # 转换为RGB模式
+                image = image.convert('RGB')
+            
+            image_info['image'] = image
+        return image
+    
     def load_images(self, file_paths: List[str]) -> List[dict]:
         """批量加载图片"""
         loaded_images = []
@@ -72,29 +79,76 @@ class ImageProcessor:
     
     def load_images_from_folder(self, folder_path: str) -> List[dict]:
         """从文件夹加载所有支持的图片"""
-        folder = Path(folder_path)
-        if not folder.exists() or not folder.is_dir():
+        # os.scandir的目录项自带文件类型信息，无需逐个stat；
+        # 目录不存在时直接捕获异常，省去额外的exists/is_dir检查
+        image_files = []
+        try:
+            with os.scandir(folder_path) as entries:
+                for entry in entries:
+                    if self.is_supported_format(entry.name) and entry.is_file():
+                        image_files.append(entry.path)
+        except (FileNotFoundError, NotADirectoryError):
             return []
         
+        return self.load_images(image_files)
+    
+    def iter_image_files(self, folder_path: str):
+        """
+        递归遍历文件夹，依次返回所有支持格式的图片路径
+        目录项自带文件类型信息，无需逐个stat；与os.walk一样不进入符号链接目录
+        """
         image_files = []
-        for file_path in folder.iterdir():
-            if file_path.is_file() and self.is_supported_format(str(file_path)):
-                image_files.append(str(file_path))
+        subdirs = []
+        try:
+            with os.scandir(folder_path) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.path)
+                    elif self.is_supported_format(entry.name) and entry.is_file():
+                        image_files.append(entry.path)
+        except OSError as e:
+            print(f"读取文件夹失败 {folder_path}: {e}")
+            return
         
-        return self.load_images(image_files)
+        yield from image_files
+        for subdir in subdirs:
+            yield from self.iter_image_files(subdir)
     
-    def create_thumbnail(self, image: Image.Image, size: Tuple[int, int] = (150, 150)) -> Image.Image:
-        """创建缩略图"""
+    def create_thumbnail(self, image: Union[str, Image.Image], size: Tuple[int, int] = (150, 150),
+                        resample: Optional[Image.Resampling] = None) -> Image.Image:
+        """
+        创建缩略图
+        未指定resample时，256x256以内的小缩略图使用BILINEAR，否则使用LANCZOS
+        image为文件路径时，JPEG在解码时直接缩小（draft），且无需先复制完整图片
+        """
+        if resample is None:
+            small = size[0] * size[1] <= 256 * 256
+            resample = Image.Resampling.BILINEAR if small else Image.Resampling.LANCZOS
+        
+        if isinstance(image, str):
+            with Image.open(image) as source:
+                source.draft('RGB', (size[0] * 2, size[1] * 2))
+                source.thumbnail(size, resample)
+                thumbnail = source if source.mode in ('RGB', 'RGBA', 'L') else source.convert('RGB')
+                thumbnail.load()
+            return thumbnail
+        
         thumbnail = image.copy()
-        thumbnail.thumbnail(size, Image.Resampling.LANCZOS)
+        thumbnail.thumbnail(size, resample)
         return thumbnail
     
     def resize_image(self, image: Image.Image, width: Optional[int] = None, 
-                    height: Optional[int] = None, scale_percent: Optional[float] = None) -> Image.Image:
+                    height: Optional[int] = None, scale_percent: Optional[float] = None,
+                    resample: Image.Resampling = Image.Resampling.LANCZOS) -> Image.Image:
         """
         调整图片尺寸
         可以按宽度、高度或百分比缩放
+        导出时使用默认的LANCZOS，交互预览可传入BILINEAR以提高速度
         """
+        # 未指定尺寸或按100%缩放时直接返回原图
+        if scale_percent == 100 or (scale_percent is None and width is None and height is None):
+            return image
+        
         original_width, original_height = image.size
         
         if scale_percent:
@@ -118,7 +172,7 @@ class ImageProcessor:
             # 没有指定尺寸，返回原图
             return image
         
-        return image.resize((new_width, new_height), Image.Resampling.LANCZOS)
+        return image.resize((new_width, new_height), resample)
     
     def save_image(self, image: Image.Image, output_path: str, 
                   format: str = 'JPEG', quality: int = 95) -> bool:
@@ -126,18 +180,16 @@ class ImageProcessor:
         保存图片
         """
         try:
-            # 确保输出目录存在
-            output_dir = Path(output_path).parent
-            output_dir.mkdir(parents=True, exist_ok=True)
+            # 确保输出目录存在（每次检查，导出期间目录被删除时同样能重新创建）
+            os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
             
             # 处理不同格式的保存
             if format.upper() == 'JPEG':
                 # JPEG不支持透明度，需要转换RGBA到RGB
                 if image.mode == 'RGBA':
-                    # 创建白色背景
-                    background = Image.new('RGB', image.size, (255, 255, 255))
-                    background.paste(image, mask=image.split()[-1])  # 使用alpha通道作为mask
-                    image = background
+                    # 与白色背景一次性合成后转为RGB，无需单独提取alpha通道
+                    background = Image.new('RGBA', image.size, (255, 255, 255, 255))
+                    image = Image.alpha_composite(background, image).convert('RGB')
                 elif image.mode not in ('RGB', 'L'):
                     image = image.convert('RGB')
                 
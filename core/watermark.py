@@ -3,8 +3,13 @@
 负责文本水印和图片水印的生成与应用
 """
 
+import functools
 import math
+import multiprocessing
 import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from PIL import Image, ImageDraw, ImageFont
 from typing import Tuple, Optional, Union
 from enum import Enum
@@ -24,6 +29,132 @@ class WatermarkPosition(Enum):
     CUSTOM = "custom"
 
 
+# 九宫格位置计算函数表: (图片宽, 图片高, 水印宽, 水印高, 边距) -> (x, y)
+_POSITION_FUNCS = {
+    WatermarkPosition.TOP_LEFT: lambda iw, ih, ww, wh, m: (m, m),
+    WatermarkPosition.TOP_CENTER: lambda iw, ih, ww, wh, m: ((iw - ww) // 2, m),
+    WatermarkPosition.TOP_RIGHT: lambda iw, ih, ww, wh, m: (iw - ww - m, m),
+    WatermarkPosition.MIDDLE_LEFT: lambda iw, ih, ww, wh, m: (m, (ih - wh) // 2),
+    WatermarkPosition.MIDDLE_CENTER: lambda iw, ih, ww, wh, m: ((iw - ww) // 2, (ih - wh) // 2),
+    WatermarkPosition.MIDDLE_RIGHT: lambda iw, ih, ww, wh, m: (iw - ww - m, (ih - wh) // 2),
+    WatermarkPosition.BOTTOM_LEFT: lambda iw, ih, ww, wh, m: (m, ih - wh - m),
+    WatermarkPosition.BOTTOM_CENTER: lambda iw, ih, ww, wh, m: ((iw - ww) // 2, ih - wh - m),
+    WatermarkPosition.BOTTOM_RIGHT: lambda iw, ih, ww, wh, m: (iw - ww - m, ih - wh - m),
+}
+
+
+# 90度整数倍旋转对应的转置操作（均为逆时针，与Image.rotate一致）
+_RIGHT_ANGLE_TRANSPOSE = {
+    90: Image.Transpose.ROTATE_90,
+    180: Image.Transpose.ROTATE_180,
+    270: Image.Transpose.ROTATE_270,
+}
+
+
+# 各平台的候选系统字体路径，本平台的路径排在最前面
+_PLATFORM_FONT_PATHS = {
+    'darwin': ("/System/Library/Fonts/Helvetica.ttc", "/System/Library/Fonts/Arial.ttf"),
+    'linux': ("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",),
+    'win32': ("C:/Windows/Fonts/arial.ttf",),
+}
+_SYSTEM_FONT_CANDIDATES = _PLATFORM_FONT_PATHS.get(sys.platform, ()) + tuple(
+    path for platform, paths in _PLATFORM_FONT_PATHS.items()
+    if platform != sys.platform for path in paths
+)
+
+
+def _detect_font_path() -> Optional[str]:
+    """返回第一个存在的系统字体路径，都不存在时返回None"""
+    for font_path in _SYSTEM_FONT_CANDIDATES:
+        if os.path.exists(font_path):
+            return font_path
+    return None
+
+
+# 系统字体路径只在导入时探测一次
+_SYSTEM_FONT_PATH = _detect_font_path()
+
+
+@functools.lru_cache(maxsize=64)
+def _load_truetype(path: str, size: int) -> ImageFont.FreeTypeFont:
+    """
+    按(字体文件路径, 字号)缓存TrueType字体，避免重复读取和解析字体文件
+    加载失败的异常不会被缓存
+    """
+    return ImageFont.truetype(path, size)
+
+
+@functools.lru_cache(maxsize=256)
+def _measure(text: str, font: ImageFont.ImageFont, stroke_width: int = 0) -> Tuple[int, int, int, int]:
+    """
+    测量文本边界框，按(文本, 字体对象, 描边宽度)缓存
+    字体对象由_load_truetype缓存复用，同一字体和字号对应同一个键
+    """
+    return font.getbbox(text, stroke_width=stroke_width)
+
+
+@functools.lru_cache(maxsize=64)
+def _load_font(font_name: Optional[str], font_size: int) -> ImageFont.ImageFont:
+    """
+    加载字体对象，按(字体名, 字号)缓存
+    """
+    # 直接尝试加载系统字体，不使用复杂的异常处理
+    font = None
+    
+    if font_name:
+        # 尝试加载指定字体
+        try:
+            font = _load_truetype(font_name, font_size)
+        except Exception as e:
+            print(f"指定字体加载失败: {e}")
+    
+    if font is None and _SYSTEM_FONT_PATH:
+        # 使用导入时确定的系统字体
+        try:
+            font = _load_truetype(_SYSTEM_FONT_PATH, font_size)
+        except Exception as e:
+            print(f"系统字体加载失败 {_SYSTEM_FONT_PATH}: {e}")
+    
+    if font is None:
+        print(f"所有字体加载失败，使用默认字体")
+        font = ImageFont.load_default()
+        
+    return font
+
+
+def _apply_watermark_job(job: tuple) -> Image.Image:
+    """
+    为单张图片应用水印（定义在模块级以便进程池调用）
+    job: (基础图像或图片路径, 已旋转的水印, 位置, 自定义位置, 边距)
+    """
+    base_image, watermark, position, custom_pos, margin = job
+    
+    # 从路径新打开的图片没有其他引用，可以直接在其上绘制
+    in_place = isinstance(base_image, str)
+    if in_place:
+        base_image = Image.open(base_image)
+    
+    return _JOB_PROCESSOR.apply_watermark(
+        base_image=base_image,
+        watermark=watermark,
+        position=position,
+        custom_pos=custom_pos,
+        margin=margin,
+        in_place=in_place
+    )
+
+
+def _get_job_outcome(func, *args) -> Union[Image.Image, Exception]:
+    """执行任务并返回结果，失败时返回异常对象而不是抛出（进程池损坏除外）"""
+    try:
+        return func(*args)
+    except BrokenProcessPool:
+        # 进程池损坏不是单张图片的问题，交给调用方改为串行处理
+        raise
+    except Exception as e:
+        return e
+
+
 class WatermarkProcessor:
     """水印处理器"""
     
@@ -40,70 +171,24 @@ class WatermarkProcessor:
         """
         计算水印位置
         """
-        if margin is None:
-            margin = self.default_margin
-            
-        img_width, img_height = image_size
-        wm_width, wm_height = watermark_size
-        
         if position == WatermarkPosition.CUSTOM and custom_pos:
             return custom_pos
         
-        # 九宫格位置计算
-        positions = {
-            WatermarkPosition.TOP_LEFT: (margin, margin),
-            WatermarkPosition.TOP_CENTER: ((img_width - wm_width) // 2, margin),
-            WatermarkPosition.TOP_RIGHT: (img_width - wm_width - margin, margin),
-            WatermarkPosition.MIDDLE_LEFT: (margin, (img_height - wm_height) // 2),
-            WatermarkPosition.MIDDLE_CENTER: ((img_width - wm_width) // 2, (img_height - wm_height) // 2),
-            WatermarkPosition.MIDDLE_RIGHT: (img_width - wm_width - margin, (img_height - wm_height) // 2),
-            WatermarkPosition.BOTTOM_LEFT: (margin, img_height - wm_height - margin),
-            WatermarkPosition.BOTTOM_CENTER: ((img_width - wm_width) // 2, img_height - wm_height - margin),
-            WatermarkPosition.BOTTOM_RIGHT: (img_width - wm_width - margin, img_height - wm_height - margin)
-        }
+        if margin is None:
+            margin = self.default_margin
         
-        return positions.get(position, positions[WatermarkPosition.MIDDLE_CENTER])
+        # 九宫格位置计算（只计算所需的位置）
+        position_func = _POSITION_FUNCS.get(position, _POSITION_FUNCS[WatermarkPosition.MIDDLE_CENTER])
+        return position_func(image_size[0], image_size[1], watermark_size[0], watermark_size[1], margin)
     
     def get_font(self, font_name: str = None, font_size: int = None) -> ImageFont.ImageFont:
         """
-        获取字体对象
+        获取字体对象（相同字体和大小只加载一次）
         """
         if font_size is None:
             font_size = self.default_font_size
-            
-        # 直接尝试加载系统字体，不使用复杂的异常处理
-        font = None
         
-        if font_name:
-            # 尝试加载指定字体
-            try:
-                font = ImageFont.truetype(font_name, font_size)
-            except Exception as e:
-                print(f"指定字体加载失败: {e}")
-        
-        if not font:
-            # 尝试系统字体路径
-            font_paths = [
-                "/System/Library/Fonts/Helvetica.ttc",  # macOS
-                "/System/Library/Fonts/Arial.ttf",      # macOS
-                "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",  # Linux
-                "C:/Windows/Fonts/arial.ttf"            # Windows
-            ]
-            
-            for font_path in font_paths:
-                if os.path.exists(font_path):
-                    try:
-                        font = ImageFont.truetype(font_path, font_size)
-                        break
-                    except Exception as e:
-                        print(f"系统字体加载失败 {font_path}: {e}")
-                        continue
-        
-        if not font:
-            print(f"所有字体加载失败，使用默认字体")
-            font = ImageFont.load_default()
-            
-        return font
+        return _load_font(font_name, font_size)
     
     def create_text_watermark(self, text: str, font_name: str = None, 
                             font_size: int = None, color: Tuple[int, int, int, int] = None,
@@ -120,29 +205,24 @@ class WatermarkProcessor:
             
         font = self.get_font(font_name, font_size)
         
-        # 获取文本尺寸
-        # 创建临时图像来测量文本尺寸
-        temp_img = Image.new('RGBA', (1, 1))
-        temp_draw = ImageDraw.Draw(temp_img)
-        
-        # 计算文本边界框
-        bbox = temp_draw.textbbox((0, 0), text, font=font)
+        # 计算文本边界框（包含描边宽度），相同文本和字体直接复用缓存结果
+        text_stroke_width = stroke_width if stroke else 0
+        bbox = _measure(text, font, text_stroke_width)
         text_width = bbox[2] - bbox[0]
         text_height = bbox[3] - bbox[1]
         
-        # 为描边和阴影预留空间
-        padding = stroke_width * 2 if stroke else 0
+        # 为阴影预留空间
         shadow_offset = 3 if shadow else 0
         
         # 创建水印图像
-        watermark_width = text_width + padding * 2 + shadow_offset
-        watermark_height = text_height + padding * 2 + shadow_offset
+        watermark_width = text_width + shadow_offset
+        watermark_height = text_height + shadow_offset
         watermark = Image.new('RGBA', (watermark_width, watermark_height), (0, 0, 0, 0))
         draw = ImageDraw.Draw(watermark)
         
-        # 文本位置
-        text_x = padding
-        text_y = padding
+        # 文本位置（抵消边界框偏移）
+        text_x = -bbox[0]
+        text_y = -bbox[1]
         
         # 绘制阴影
         if shadow:
@@ -150,17 +230,9 @@ class WatermarkProcessor:
             draw.text((text_x + shadow_offset, text_y + shadow_offset), text, 
                      font=font, fill=shadow_color)
         
-        # 绘制描边
-        if stroke:
-            # 绘制描边（通过在周围绘制多次文本实现）
-            for dx in range(-stroke_width, stroke_width + 1):
-                for dy in range(-stroke_width, stroke_width + 1):
-                    if dx != 0 or dy != 0:
-                        draw.text((text_x + dx, text_y + dy), text, 
-                                font=font, fill=stroke_color)
-        
-        # 绘制主文本
-        draw.text((text_x, text_y), text, font=font, fill=color)
+        # 绘制主文本，描边由PIL一次完成
+        draw.text((text_x, text_y), text, font=font, fill=color,
+                 stroke_width=text_stroke_width, stroke_fill=stroke_color)
         
         return watermark
     
@@ -189,9 +261,10 @@ class WatermarkProcessor:
             # 调整透明度
             if opacity < 255:
                 # 获取alpha通道
-                alpha = watermark.split()[-1]
-                # 调整alpha值
-                alpha = alpha.point(lambda p: int(p * opacity / 255))
+                alpha = watermark.getchannel('A')
+                # 调整alpha值（预先计算查找表，由PIL在C层应用）
+                lut = [int(p * opacity / 255) for p in range(256)]
+                alpha = alpha.point(lut)
                 # 重新组合
                 watermark.putalpha(alpha)
             
@@ -205,24 +278,33 @@ class WatermarkProcessor:
         """
         旋转水印
         """
+        angle = angle % 360
         if angle == 0:
             return watermark
+        
+        # 90度整数倍直接转置像素，无需重采样
+        if angle in _RIGHT_ANGLE_TRANSPOSE:
+            return watermark.transpose(_RIGHT_ANGLE_TRANSPOSE[angle])
             
         # 旋转图像，保持透明背景
-        rotated = watermark.rotate(angle, expand=True, fillcolor=(0, 0, 0, 0))
+        rotated = watermark.rotate(angle, resample=Image.Resampling.BILINEAR,
+                                   expand=True, fillcolor=(0, 0, 0, 0))
         return rotated
     
     def apply_watermark(self, base_image: Image.Image, watermark: Image.Image,
                        position: WatermarkPosition = WatermarkPosition.MIDDLE_CENTER,
                        custom_pos: Optional[Tuple[int, int]] = None,
                        margin: int = None,
-                       rotation: float = 0) -> Image.Image:
+                       rotation: float = 0,
+                       in_place: bool = False) -> Image.Image:
         """
         将水印应用到基础图像上
+        in_place为True时直接修改基础图像（调用方不再需要原图时使用）
         """
-        # 确保基础图像有透明通道
+        # 确保基础图像有透明通道（转换得到的是新图像，可直接在其上绘制）
         if base_image.mode != 'RGBA':
             base_image = base_image.convert('RGBA')
+            in_place = True
         
         # 旋转水印
         if rotation != 0:
@@ -237,69 +319,95 @@ class WatermarkProcessor:
             margin
         )
         
-        # 创建结果图像
-        result = base_image.copy()
+        # 完全不透明的水印（如未旋转的无透明通道图片）无需混合，直接粘贴
+        opaque = watermark.getchannel('A').getextrema() == (255, 255)
         
-        # 粘贴水印
-        result.paste(watermark, wm_pos, watermark)
+        # 需要保留原图时只复制一次，之后在副本上就地合成
+        result = base_image if in_place else base_image.copy()
         
+        if opaque:
+            result.paste(watermark, wm_pos)
+            return result
+        
+        # 直接在图像上合成水印，超出左/上边界的部分从水印中裁掉
+        x, y = wm_pos
+        source = (max(-x, 0), max(-y, 0))
+        if source[0] < watermark.width and source[1] < watermark.height:
+            result.alpha_composite(watermark, (max(x, 0), max(y, 0)), source)
         return result
     
-    def batch_apply_watermark(self, images: list, watermark_config: dict) -> list:
+    def batch_apply_watermark(self, images: list, watermark_config: dict,
+                            max_workers: Optional[int] = None) -> list:
         """
         批量应用水印
         watermark_config包含水印的所有配置信息
+        max_workers为并行进程数，默认使用CPU核心数，为1时串行处理
         """
         results = []
         
-        for image_info in images:
+        # 水印配置在整个批次中不变，只需创建并旋转一次
+        if watermark_config['type'] == 'text':
+            watermark = self.create_text_watermark(
+                text=watermark_config['text'],
+                font_name=watermark_config.get('font_name'),
+                font_size=watermark_config.get('font_size', self.default_font_size),
+                color=watermark_config.get('color', self.default_font_color),
+                bold=watermark_config.get('bold', False),
+                italic=watermark_config.get('italic', False),
+                shadow=watermark_config.get('shadow', False),
+                stroke=watermark_config.get('stroke', False),
+                stroke_width=watermark_config.get('stroke_width', 2),
+                stroke_color=watermark_config.get('stroke_color')
+            )
+        elif watermark_config['type'] == 'image':
+            watermark = self.create_image_watermark(
+                watermark_path=watermark_config['image_path'],
+                scale_percent=watermark_config.get('scale_percent', 100.0),
+                opacity=watermark_config.get('opacity', 255)
+            )
+        else:
+            return results
+        
+        if watermark is None:
+            return results
+        
+        watermark = self.rotate_watermark(watermark, watermark_config.get('rotation', 0))
+        position = WatermarkPosition(watermark_config.get('position', 'middle_center'))
+        # 尚未解码的图片只传递路径，由子进程自行打开
+        jobs = [
+            (image_info['image'] if image_info.get('image') is not None else image_info['path'],
+             watermark, position, watermark_config.get('custom_pos'), watermark_config.get('margin'))
+            for image_info in images
+        ]
+        
+        # 各图片相互独立，多张图片时使用进程池并行处理
+        if max_workers is None:
+            max_workers = os.cpu_count() or 1
+        outcomes = []
+        if max_workers > 1 and len(jobs) > 1:
             try:
-                base_image = image_info['image']
-                
-                # 根据配置创建水印
-                if watermark_config['type'] == 'text':
-                    watermark = self.create_text_watermark(
-                        text=watermark_config['text'],
-                        font_name=watermark_config.get('font_name'),
-                        font_size=watermark_config.get('font_size', self.default_font_size),
-                        color=watermark_config.get('color', self.default_font_color),
-                        bold=watermark_config.get('bold', False),
-                        italic=watermark_config.get('italic', False),
-                        shadow=watermark_config.get('shadow', False),
-                        stroke=watermark_config.get('stroke', False),
-                        stroke_width=watermark_config.get('stroke_width', 2),
-                        stroke_color=watermark_config.get('stroke_color')
-                    )
-                elif watermark_config['type'] == 'image':
-                    watermark = self.create_image_watermark(
-                        watermark_path=watermark_config['image_path'],
-                        scale_percent=watermark_config.get('scale_percent', 100.0),
-                        opacity=watermark_config.get('opacity', 255)
-                    )
-                else:
-                    continue
-                
-                if watermark is None:
-                    continue
-                
-                # 应用水印
-                result_image = self.apply_watermark(
-                    base_image=base_image,
-                    watermark=watermark,
-                    position=WatermarkPosition(watermark_config.get('position', 'middle_center')),
-                    custom_pos=watermark_config.get('custom_pos'),
-                    margin=watermark_config.get('margin'),
-                    rotation=watermark_config.get('rotation', 0)
-                )
-                
-                # 创建结果信息
-                result_info = image_info.copy()
-                result_info['watermarked_image'] = result_image
-                results.append(result_info)
-                
-            except Exception as e:
-                print(f"处理图片失败 {image_info.get('name', 'Unknown')}: {str(e)}")
+                # 使用spawn启动子进程，避免fork复制调用方（如GUI）中其他线程持有的锁
+                with ProcessPoolExecutor(max_workers=min(max_workers, len(jobs)),
+                                         mp_context=multiprocessing.get_context('spawn')) as executor:
+                    futures = [executor.submit(_apply_watermark_job, job) for job in jobs]
+                    for future in futures:
+                        outcomes.append(_get_job_outcome(future.result))
+            except (OSError, BrokenProcessPool) as e:
+                print(f"进程池不可用，剩余图片改为串行处理: {str(e)}")
+        
+        # 串行处理（或进程池损坏后）尚未完成的图片
+        for job in jobs[len(outcomes):]:
+            outcomes.append(_get_job_outcome(_apply_watermark_job, job))
+        
+        for image_info, outcome in zip(images, outcomes):
+            if isinstance(outcome, Exception):
+                print(f"处理图片失败 {image_info.get('name', 'Unknown')}: {str(outcome)}")
                 continue
+            
+            # 创建结果信息
+            result_info = image_info.copy()
+            result_info['watermarked_image'] = outcome
+            results.append(result_info)
         
         return results
     
@@ -390,4 +498,8 @@ class WatermarkProcessor:
             custom_pos=config.get('custom_pos'),
             margin=config.get('margin'),
             rotation=config.get('rotation', 0)
-        )
\ No newline at end of file
+        )
+
+
+# 批处理任务共用的处理器实例（每个工作进程导入模块时创建一次）
+_JOB_PROCESSOR = WatermarkProcessor()
@@ -6,6 +6,8 @@
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, colorchooser
 import os
+import re
+import time
 from pathlib import Path
 from typing import List, Optional, Dict, Any
 
@@ -15,6 +17,9 @@ from core.config_manager import ConfigManager
 from utils.file_utils import validate_output_directory, get_available_fonts, get_font_name_from_path
 from utils.image_utils import pil_to_tkinter, resize_for_display, create_thumbnail_with_border
 
+# 窗口几何字符串，如"1200x800+100+50"（位置部分可能缺失或为负数）
+_GEOMETRY_RE = re.compile(r'(\d+)x(\d+)(?:\+(-?\d+)\+(-?\d+))?')
+
 
 class MainWindow:
     """主窗口类"""
@@ -36,6 +41,15 @@ class MainWindow:
         self.watermark_config = self.config_manager.get_default_watermark_config()
         self.export_config = self.config_manager.get_default_export_config()
         
+        # 状态栏/进度条刷新节流（最多20次/秒）
+        self._last_status_flush = 0.0
+        self._last_progress_flush = 0.0
+        # 窗口尺寸和位置 (宽, 高, x, y)，由<Configure>事件更新
+        self._window_geometry = None
+        # 水印设置面板尺寸变化时合并滚动区域刷新
+        self._pending_scrollregion = None
+        self._last_scrollregion = None
+        
         # GUI变量
         self.setup_variables()
         
@@ -233,8 +247,18 @@ class MainWindow:
         # 水印设置标签页
         self.create_watermark_tab(notebook)
         
-        # 导出设置标签页
-        self.create_export_tab(notebook)
+        # 导出设置标签页（内容在首次切换到该页时才创建）
+        self.export_tab_frame = ttk.Frame(notebook)
+        notebook.add(self.export_tab_frame, text="导出设置")
+        self._export_tab_built = False
+        notebook.bind('<<NotebookTabChanged>>', self.on_settings_tab_changed)
+    
+    def on_settings_tab_changed(self, event):
+        """设置标签页切换"""
+        notebook = event.widget
+        if not self._export_tab_built and notebook.select() == str(self.export_tab_frame):
+            self._export_tab_built = True
+            self.create_export_tab(self.export_tab_frame)
     
     def create_watermark_tab(self, parent):
         """创建水印设置标签页"""
@@ -248,7 +272,7 @@ class MainWindow:
         
         scrollable_frame.bind(
             "<Configure>",
-            lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
+            lambda e: self.schedule_scrollregion_update(canvas)
         )
         
         canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
@@ -336,11 +360,21 @@ class MainWindow:
         canvas.pack(side="left", fill="both", expand=True)
         scrollbar.pack(side="right", fill="y")
     
-    def create_export_tab(self, parent):
-        """创建导出设置标签页"""
-        export_frame = ttk.Frame(parent)
-        parent.add(export_frame, text="导出设置")
-        
+    def schedule_scrollregion_update(self, canvas, delay=50):
+        """合并连续的<Configure>事件，每个间隔内只计算一次滚动区域"""
+        if self._pending_scrollregion is None:
+            self._pending_scrollregion = self.root.after(delay, self._update_scrollregion, canvas)
+    
+    def _update_scrollregion(self, canvas):
+        """重新计算滚动区域，未变化时不重新配置画布"""
+        self._pending_scrollregion = None
+        region = canvas.bbox("all")
+        if region != self._last_scrollregion:
+            self._last_scrollregion = region
+            canvas.configure(scrollregion=region)
+    
+    def create_export_tab(self, export_frame):
+        """创建导出设置标签页内容"""
         # 输出目录
         dir_frame = ttk.LabelFrame(export_frame, text="输出设置", padding=5)
         dir_frame.pack(fill=tk.X, pady=2)
@@ -420,9 +454,20 @@ class MainWindow:
         self.root.bind('<Control-s>', lambda e: self.export_images())
         self.root.bind('<Control-q>', lambda e: self.root.quit())
         
+        # 记录窗口尺寸和位置，保存设置时无需再解析geometry字符串
+        self.root.bind('<Configure>', self.on_window_configure)
+        
         # 窗口关闭事件
         self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
     
+    def on_window_configure(self, event):
+        """窗口尺寸或位置变化"""
+        if event.widget is self.root:
+            # event.x/y是相对窗口管理器边框的坐标，位置改用winfo_x/y，
+            # 与root.geometry()和恢复窗口时使用的坐标一致
+            self._window_geometry = (event.width, event.height,
+                                     self.root.winfo_x(), self.root.winfo_y())
+    
     def load_settings(self):
         """加载应用设置"""
         settings = self.config_manager.load_settings()
@@ -445,30 +490,42 @@ class MainWindow:
     
     def save_settings(self):
         """保存应用设置"""
-        # 获取窗口大小和位置
-        geometry = self.root.geometry()
-        size_pos = geometry.split('+')
-        size = size_pos[0].split('x')
-        
-        settings = {
-            'window_size': [int(size[0]), int(size[1])],
-            'last_output_dir': self.var_output_dir.get()
-        }
-        
-        if len(size_pos) >= 3:
-            settings['window_position'] = [int(size_pos[1]), int(size_pos[2])]
+        # 获取窗口大小和位置（优先使用<Configure>事件记录的值）
+        if self._window_geometry:
+            width, height, x, y = self._window_geometry
+            settings = {
+                'window_size': [width, height],
+                'window_position': [x, y],
+                'last_output_dir': self.var_output_dir.get()
+            }
+        else:
+            match = _GEOMETRY_RE.match(self.root.geometry())
+            
+            settings = {
+                'window_size': [int(match[1]), int(match[2])],
+                'last_output_dir': self.var_output_dir.get()
+            }
+            
+            if match[3] is not None:
+                settings['window_position'] = [int(match[3]), int(match[4])]
         
         self.config_manager.save_settings(settings)
     
     def update_status(self, message: str):
-        """更新状态栏"""
+        """更新状态栏（强制重绘限制在20次/秒以内）"""
         self.status_label.config(text=message)
-        self.root.update_idletasks()
+        now = time.monotonic()
+        if now - self._last_status_flush > 0.05:
+            self._last_status_flush = now
+            self.root.update_idletasks()
     
     def update_progress(self, value: float):
-        """更新进度条"""
+        """更新进度条（强制重绘限制在20次/秒以内，完成时总是刷新）"""
         self.progress_var.set(value)
-        self.root.update_idletasks()
+        now = time.monotonic()
+        if value >= 100 or now - self._last_progress_flush > 0.05:
+            self._last_progress_flush = now
+            self.root.update_idletasks()
     
     # 事件处理方法将在下一部分继续...
     
@@ -8,19 +8,265 @@ ImageWatermarker - Fixed Complete Version
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, colorchooser, simpledialog
 import tkinterdnd2 as tkdnd
+import functools
 import os
-import json
+from collections import OrderedDict
 from PIL import Image, ImageTk, ImageFont, ImageDraw
 from datetime import datetime
 from pathlib import Path
+import multiprocessing
+import queue
 import threading
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 
 from core.image_processor import ImageProcessor
 from core.watermark import WatermarkProcessor, WatermarkPosition
-from core.config_manager import ConfigManager
-from utils.image_utils import resize_for_display
+from core.config_manager import dumps_json, loads_json, atomic_write
+from utils.image_utils import resize_for_display, has_pillow_simd
+from utils.thumbnail import load_cached_thumbnail
+
+try:
+    import numpy as np
+    from turbojpeg import TurboJPEG, TJPF_RGB, TJPF_GRAY, TJSAMP_420, TJSAMP_GRAY
+except ImportError:  # PyTurboJPEG为可选依赖，缺失时使用Pillow编码JPEG
+    TurboJPEG = None
+
+# 界面预设位置名称对应的水印位置
+_POS_TABLE = {
+    '左上': WatermarkPosition.TOP_LEFT,
+    '上中': WatermarkPosition.TOP_CENTER,
+    '右上': WatermarkPosition.TOP_RIGHT,
+    '左中': WatermarkPosition.MIDDLE_LEFT,
+    '中心': WatermarkPosition.MIDDLE_CENTER,
+    '右中': WatermarkPosition.MIDDLE_RIGHT,
+    '左下': WatermarkPosition.BOTTOM_LEFT,
+    '下中': WatermarkPosition.BOTTOM_CENTER,
+    '右下': WatermarkPosition.BOTTOM_RIGHT,
+}
+
+
+@functools.lru_cache(maxsize=64)
+def _load_styled_font(font_name, font_size, bold, italic):
+    """
+    按(字体名, 字号, 粗体, 斜体)加载字体并缓存
+    找不到样式字体变体的结果同样被缓存，重复渲染时不再逐个尝试
+    """
+    # 尝试根据样式选择字体文件
+    if bold and italic:
+        # 粗斜体
+        font_variants = [f"{font_name} Bold Italic", f"{font_name}-BoldItalic", f"{font_name}BI"]
+    elif bold:
+        # 粗体
+        font_variants = [f"{font_name} Bold", f"{font_name}-Bold", f"{font_name}B"]
+    elif italic:
+        # 斜体
+        font_variants = [f"{font_name} Italic", f"{font_name}-Italic", f"{font_name}I"]
+    else:
+        # 常规
+        font_variants = [font_name]
+    
+    # 尝试加载字体变体
+    for variant in font_variants:
+        try:
+            return ImageFont.truetype(variant, font_size)
+        except:
+            continue
+    
+    # 如果找不到样式字体，使用基础字体并通过其他方式模拟
+    try:
+        return ImageFont.truetype(font_name, font_size)
+    except:
+        return ImageFont.load_default()
+
+
+_EXPORT_PROCESSOR = None  # 导出子进程内复用的水印处理器
+_TURBO_JPEG = None  # 按需创建的libjpeg-turbo编码器，False表示库不可用
+
+
+def _paste_watermark(base_image, watermark, rel_pos, position, processor, margin=20):
+    """
+    将已旋转的水印贴到图片副本上
+    rel_pos为手动拖拽的相对位置，为None时按预设位置计算坐标
+    """
+    if base_image.mode != 'RGBA':
+        result = base_image.convert('RGBA')
+    else:
+        result = base_image.copy()
+    
+    if rel_pos:
+        # 手动位置
+        x = int(rel_pos[0] * result.width - watermark.width / 2)
+        y = int(rel_pos[1] * result.height - watermark.height / 2)
+    else:
+        # 预设位置由水印处理器计算坐标
+        x, y = processor.calculate_position(result.size, watermark.size, position, margin=margin)
+    
+    # 确保位置在图片范围内
+    x = max(0, min(x, result.width - watermark.width))
+    y = max(0, min(y, result.height - watermark.height))
+    
+    # 只粘贴水印中不透明部分的外接矩形（旋转后的四角和文字留白都是全透明的）
+    bbox = watermark.getchannel('A').getbbox()
+    if bbox is None:
+        return result
+    if bbox != (0, 0, watermark.width, watermark.height):
+        watermark = watermark.crop(bbox)
+        x += bbox[0]
+        y += bbox[1]
+    
+    result.paste(watermark, (x, y), watermark)
+    return result
+
+
+def _save_export_image(image, output_path, output_format, quality):
+    """按输出格式保存导出图片，JPEG与白色背景合成后保存"""
+    if output_format == 'jpeg':
+        if image.mode == 'RGBA':
+            # 与白色背景一次性合成后转为RGB
+            background = Image.new('RGBA', image.size, (255, 255, 255, 255))
+            image = Image.alpha_composite(background, image).convert('RGB')
+        
+        if _turbo_jpeg_save(image, output_path, quality):
+            return
+        image.save(output_path, 'JPEG', quality=quality)
+    else:
+        image.save(output_path, 'PNG')
+
+
+def _turbo_jpeg_save(image, output_path, quality):
+    """
+    使用libjpeg-turbo编码并写入JPEG（编码期间释放GIL，线程池导出时可并行），
+    PyTurboJPEG未安装、图片模式不支持或编码写入失败时返回False，由调用方回退到Pillow
+    """
+    global _TURBO_JPEG
+    if TurboJPEG is None or _TURBO_JPEG is False or image.mode not in ('RGB', 'L'):
+        return False
+    if _TURBO_JPEG is None:
+        try:
+            _TURBO_JPEG = TurboJPEG()
+        except (OSError, RuntimeError) as e:
+            print(f"libjpeg-turbo不可用，使用Pillow编码JPEG: {e}")
+            _TURBO_JPEG = False
+            return False
+    
+    try:
+        if image.mode == 'RGB':
+            data = _TURBO_JPEG.encode(np.asarray(image), quality=quality,
+                                      pixel_format=TJPF_RGB, jpeg_subsample=TJSAMP_420)
+        else:
+            data = _TURBO_JPEG.encode(np.asarray(image)[:, :, None], quality=quality,
+                                      pixel_format=TJPF_GRAY, jpeg_subsample=TJSAMP_GRAY)
+    except (OSError, RuntimeError, ValueError) as e:
+        print(f"libjpeg-turbo编码失败，改用Pillow编码: {e}")
+        return False
+    
+    # 先写入临时文件再替换，写入中断时不会留下不完整的JPEG
+    tmp_path = output_path + '.tmp'
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, output_path)
+    except OSError as e:
+        print(f"写入JPEG失败，改用Pillow保存: {e}")
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        return False
+    return True
+
+
+def _unique_paths(paths):
+    """
+    为同名的导出路径依次加上_1、_2等后缀，避免不同文件夹中的同名图片相互覆盖
+    已使用的路径记录在集合中，检查重名无需访问文件系统
+    """
+    used = set()
+    result = []
+    for path in paths:
+        key = os.path.normcase(path)
+        if key in used:
+            root, ext = os.path.splitext(path)
+            n = 1
+            while os.path.normcase(f"{root}_{n}{ext}") in used:
+                n += 1
+            path = f"{root}_{n}{ext}"
+            key = os.path.normcase(path)
+        used.add(key)
+        result.append(path)
+    return result
+
+
+def _export_job(job):
+    """
+    导出单张图片（定义在模块级以便进程池调用）
+    job: (源图片路径, 输出路径, 已旋转的水印或None, 手动相对位置, 预设位置, 输出格式, JPEG质量)
+    """
+    global _EXPORT_PROCESSOR
+    src_path, output_path, watermark, rel_pos, position, output_format, quality = job
+    
+    # 源文件在导出完成后立即关闭，进程池中的工作进程不会积累打开的文件句柄
+    with Image.open(src_path) as image:
+        if image.mode not in ('RGB', 'RGBA', 'L'):
+            image = image.convert('RGB')
+        
+        if watermark is not None:
+            # 每个子进程只创建一次水印处理器
+            if _EXPORT_PROCESSOR is None:
+                _EXPORT_PROCESSOR = WatermarkProcessor()
+            image = _paste_watermark(image, watermark, rel_pos, position, _EXPORT_PROCESSOR)
+        
+        _save_export_image(image, output_path, output_format, quality)
+
+
+def _export_chunk(chunk):
+    """
+    依次导出一组图片（定义在模块级以便进程池调用），水印等设置每组只需传递一次
+    chunk: ([(源图片路径, 输出路径), ...], 已旋转的水印或None, 手动相对位置, 预设位置, 输出格式, JPEG质量)
+    返回每张图片的错误信息，成功时为None
+    """
+    pairs, *settings = chunk
+    errors = []
+    for src_path, output_path in pairs:
+        try:
+            _export_job((src_path, output_path, *settings))
+            errors.append(None)
+        except Exception as e:
+            errors.append(str(e))
+    return errors
+
 
 class CompleteWatermarkApp:
+    # 可见范围前后预先生成缩略图的行数
+    THUMB_BUFFER_ROWS = 20
+    # 超出可见范围多少行后释放缩略图
+    THUMB_KEEP_ROWS = 100
+    # 图片列表每批插入的行数
+    TREE_INSERT_CHUNK = 100
+    # 后台导入时每批交回主线程的图片数
+    LOAD_BATCH_SIZE = 200
+    # 批量导出的图片数达到该值时才使用进程池
+    EXPORT_PROCESS_MIN_JOBS = 16
+    # 进程池导出时每个任务包含的图片数
+    EXPORT_CHUNK_SIZE = 4
+    # 缓存的预览图数量
+    PREVIEW_CACHE_SIZE = 8
+    # 缓存的文字水印图块数量
+    TEXT_TILE_CACHE_SIZE = 16
+    # 缓存的应用透明度后的文字水印数量
+    WM_CACHE_SIZE = 32
+    # 缓存的图片水印数量
+    IMAGE_WM_CACHE_SIZE = 4
+    # 缓存预览金字塔的图片数量
+    PYRAMID_CACHE_SIZE = 4
+    # 影响预览外观的设置变量（属性名），其值由写入回调同步到设置快照
+    PREVIEW_VARS = (
+        'watermark_type', 'text_content', 'font_family', 'font_bold', 'font_italic',
+        'font_size', 'font_color', 'opacity', 'text_shadow', 'text_outline',
+        'effect_color', 'watermark_image_path', 'image_scale', 'position', 'rotation',
+    )
+    
     def __init__(self):
         self.root = tkdnd.Tk()
         self.root.title("ImageWatermarker - 完整功能版 (修复版)")
@@ -29,13 +275,50 @@ class CompleteWatermarkApp:
         # 核心组件
         self.image_processor = ImageProcessor()
         self.watermark_processor = WatermarkProcessor()
-        self.config_manager = ConfigManager()
         
         # 数据存储
         self.loaded_images = []
+        self._loaded_paths = set()  # 已导入图片的路径，用于跳过重复导入
+        # 后台导入：扫描和读取文件头在后台线程中进行，结果经队列分批交回主线程
+        self._load_queue = queue.Queue()
+        self._load_polling = False
+        self._pending_loads = 0  # 尚未完成的导入数量
+        self._load_total = 0  # 进行中的导入需要读取的文件数
+        self._load_done = 0  # 已读取的文件数
         self.current_image_index = 0
-        self.image_refs = []  # 保存图像引用
+        self._preview_photo = None  # 复用的预览PhotoImage
+        self._preview_photo_key = None  # 预览PhotoImage的(尺寸, 模式)
+        self._preview_item = None  # 预览图在画布上的图像项
+        self._preview_center = None
+        self._preview_cache = OrderedDict()  # 预览参数 -> 缩放后的预览图（LRU）
+        self._canvas_size = (0, 0)  # 预览画布尺寸，由<Configure>事件更新
+        self._preview_dirty = False  # 窗口不可见时跳过了预览刷新
+        self._preview_base = None  # 当前图片缩小到画布尺寸的底图 (路径, 尺寸, 图片)
+        self._text_tile_cache = OrderedDict()  # 文字样式 -> 不透明的文字水印图块（LRU）
+        self._wm_cache = OrderedDict()  # (文字样式, 透明度) -> 应用透明度后的文字水印（LRU）
+        self._prepared_wm = None  # 渲染线程上次缩放旋转的水印：(水印, 缩放, 角度, 结果)
+        self._image_wm_cache = OrderedDict()  # (路径, 修改时间, 缩放) -> 缩放后的水印图片（LRU）
+        self._pyramid_cache = OrderedDict()  # 图片路径 -> 逐级减半的预览图列表（LRU）
+        
+        # 预览在后台线程中渲染：请求队列只保留最新一个，结果经队列交回主线程
+        self._render_queue = queue.Queue(maxsize=1)
+        self._rendered_queue = queue.Queue()
+        self._latest_render_key = None  # 等待显示的最新预览
+        self._render_polling = False
+        threading.Thread(target=self._render_loop, daemon=True).start()
         self.thumbnail_refs = {}  # 缩略图引用
+        
+        # 缩略图和导入时的图片信息在线程池中读取，缩略图结果经队列交回主线程
+        self._thumb_pool = ThreadPoolExecutor(max_workers=os.cpu_count())
+        self._thumb_queue = queue.Queue()
+        self._thumb_generation = 0
+        self._pending_thumbs = 0
+        self._thumb_polling = False
+        self._tree_items = []  # 列表行ID，与loaded_images顺序一致
+        self._item_to_index = {}  # 列表行ID -> loaded_images中的索引
+        self._thumb_requested = set()  # 已请求或已生成缩略图的行索引
+        self._tree_inserting = False  # 是否正在分批插入列表行
+        self._export_pool = None  # 批量导出进程池，首次批量导出时创建
         self.templates = {}  # 水印模板
         
         # 拖拽状态
@@ -44,9 +327,26 @@ class CompleteWatermarkApp:
         self.drag_start_y = 0
         self.watermark_position = None  # 手动位置，None表示使用预设位置
         
+        # 滑块拖动时合并预览刷新
+        self._pending_render = None
+        self._preview_suspended = False  # 批量修改设置期间暂停安排预览刷新
+        # 左侧面板尺寸变化时合并滚动区域刷新
+        self._pending_scrollregion = None
+        self._last_scrollregion = None
+        # 上次生效的文本/位置/格式，值未变化时跳过刷新
+        self._last_watermark_text = None
+        self._last_position = None
+        self._last_output_format = None
+        
         # 创建界面
         self.create_widgets()
+        self.watch_preview_vars()
         self.setup_drag_drop()
+        # 模板和上次的设置在窗口首次绘制后再读取，窗口可以更早显示
+        self.root.after_idle(self.deferred_init)
+    
+    def deferred_init(self):
+        """窗口显示后执行的初始化"""
         self.load_templates()
         self.load_last_settings()
     
@@ -84,7 +384,7 @@ class CompleteWatermarkApp:
         # 配置滚动
         self.scrollable_frame.bind(
             "<Configure>",
-            lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
+            lambda e: self.schedule_scrollregion_update(canvas)
         )
         
         canvas.create_window((0, 0), window=self.scrollable_frame, anchor="nw")
@@ -118,8 +418,10 @@ class CompleteWatermarkApp:
         
         ttk.Button(file_frame, text="导入图片", command=self.import_images).pack(fill=tk.X, padx=5, pady=2)
         ttk.Button(file_frame, text="导入文件夹", command=self.import_folder).pack(fill=tk.X, padx=5, pady=2)
-        ttk.Button(file_frame, text="导出当前", command=self.export_current).pack(fill=tk.X, padx=5, pady=2)
-        ttk.Button(file_frame, text="批量导出", command=self.export_all).pack(fill=tk.X, padx=5, pady=2)
+        self.export_current_button = ttk.Button(file_frame, text="导出当前", command=self.export_current)
+        self.export_current_button.pack(fill=tk.X, padx=5, pady=2)
+        self.export_all_button = ttk.Button(file_frame, text="批量导出", command=self.export_all)
+        self.export_all_button.pack(fill=tk.X, padx=5, pady=2)
         
         # 水印类型选择
         type_frame = ttk.LabelFrame(parent, text="水印类型")
@@ -151,7 +453,7 @@ class CompleteWatermarkApp:
         ttk.Label(self.text_frame, text="水印文本:").grid(row=0, column=0, sticky=tk.W, padx=5, pady=2)
         self.text_content = tk.StringVar(value=datetime.now().strftime("%Y-%m-%d"))
         ttk.Entry(self.text_frame, textvariable=self.text_content, width=25).grid(row=0, column=1, columnspan=2, sticky=tk.W, padx=5)
-        self.text_content.trace('w', lambda *args: self.update_preview())
+        self.text_content.trace('w', lambda *args: self.on_text_changed())
         
         # 字体设置
         ttk.Label(self.text_frame, text="字体:").grid(row=1, column=0, sticky=tk.W, padx=5, pady=2)
@@ -159,15 +461,15 @@ class CompleteWatermarkApp:
         font_combo = ttk.Combobox(self.text_frame, textvariable=self.font_family, width=15)
         font_combo.grid(row=1, column=1, sticky=tk.W, padx=5)
         font_combo['values'] = ["Arial", "Times New Roman", "Helvetica", "Courier New"]
-        font_combo.bind('<<ComboboxSelected>>', lambda e: self.update_preview())
+        font_combo.bind('<<ComboboxSelected>>', lambda e: self.schedule_preview_update())
         
         # 字体样式
         style_frame = ttk.Frame(self.text_frame)
         style_frame.grid(row=1, column=2, sticky=tk.W, padx=5)
         self.font_bold = tk.BooleanVar()
         self.font_italic = tk.BooleanVar()
-        ttk.Checkbutton(style_frame, text="粗体", variable=self.font_bold, command=self.update_preview).pack(side=tk.LEFT)
-        ttk.Checkbutton(style_frame, text="斜体", variable=self.font_italic, command=self.update_preview).pack(side=tk.LEFT)
+        ttk.Checkbutton(style_frame, text="粗体", variable=self.font_bold, command=self.schedule_preview_update).pack(side=tk.LEFT)
+        ttk.Checkbutton(style_frame, text="斜体", variable=self.font_italic, command=self.schedule_preview_update).pack(side=tk.LEFT)
         
         # 字体大小
         ttk.Label(self.text_frame, text="字体大小:").grid(row=2, column=0, sticky=tk.W, padx=5, pady=2)
@@ -208,8 +510,8 @@ class CompleteWatermarkApp:
         
         self.text_shadow = tk.BooleanVar()
         self.text_outline = tk.BooleanVar()
-        ttk.Checkbutton(enhance_frame, text="阴影", variable=self.text_shadow, command=self.update_preview).pack(side=tk.LEFT)
-        ttk.Checkbutton(enhance_frame, text="描边", variable=self.text_outline, command=self.update_preview).pack(side=tk.LEFT)
+        ttk.Checkbutton(enhance_frame, text="阴影", variable=self.text_shadow, command=self.schedule_preview_update).pack(side=tk.LEFT)
+        ttk.Checkbutton(enhance_frame, text="描边", variable=self.text_outline, command=self.schedule_preview_update).pack(side=tk.LEFT)
         
         # 阴影/描边颜色
         ttk.Label(self.text_frame, text="效果颜色:").grid(row=6, column=0, sticky=tk.W, padx=5, pady=2)
@@ -347,11 +649,11 @@ class CompleteWatermarkApp:
         self.image_tree.column("format", width=80)
         
         # 滚动条
-        tree_scroll = ttk.Scrollbar(list_frame, orient=tk.VERTICAL, command=self.image_tree.yview)
-        self.image_tree.configure(yscrollcommand=tree_scroll.set)
+        self.tree_scroll = ttk.Scrollbar(list_frame, orient=tk.VERTICAL, command=self.image_tree.yview)
+        self.image_tree.configure(yscrollcommand=self.on_image_list_scroll)
         
         self.image_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        tree_scroll.pack(side=tk.RIGHT, fill=tk.Y)
+        self.tree_scroll.pack(side=tk.RIGHT, fill=tk.Y)
         
         # 绑定选择事件
         self.image_tree.bind('<<TreeviewSelect>>', self.on_image_select)
@@ -372,6 +674,9 @@ class CompleteWatermarkApp:
         self.preview_canvas.bind("<Button-1>", self.on_canvas_click)
         self.preview_canvas.bind("<B1-Motion>", self.on_canvas_drag)
         self.preview_canvas.bind("<ButtonRelease-1>", self.on_canvas_release)
+        self.preview_canvas.bind("<Configure>", self.on_preview_canvas_resize)
+        # 窗口最小化期间跳过的预览刷新在窗口恢复显示时补上
+        self.root.bind("<Map>", self.on_window_map, add='+')
     
     def create_menu(self):
         """创建菜单栏"""
@@ -415,21 +720,18 @@ class CompleteWatermarkApp:
         self.load_dropped_files(files)
     
     def load_dropped_files(self, files):
-        """加载拖拽的文件"""
-        image_files = []
+        """加载拖拽的文件（文件夹扫描在后台线程中进行）"""
+        self.load_images_to_list(self.iter_dropped_files(files))
+    
+    def iter_dropped_files(self, files):
+        """依次返回拖拽的图片文件以及拖拽的文件夹中的图片"""
         for file_path in files:
             if os.path.isfile(file_path):
-                if file_path.lower().endswith(('.png', '.jpg', '.jpeg', '.bmp', '.tiff', '.gif')):
-                    image_files.append(file_path)
+                if self.image_processor.is_supported_format(file_path):
+                    yield file_path
             elif os.path.isdir(file_path):
                 # 扫描文件夹
-                for root, dirs, files in os.walk(file_path):
-                    for file in files:
-                        if file.lower().endswith(('.png', '.jpg', '.jpeg', '.bmp', '.tiff', '.gif')):
-                            image_files.append(os.path.join(root, file))
-        
-        if image_files:
-            self.load_images_to_list(image_files)
+                yield from self.image_processor.iter_image_files(file_path)
     
     # 事件处理方法
     def on_type_change(self):
@@ -440,11 +742,24 @@ class CompleteWatermarkApp:
         else:
             self.text_frame.pack_forget()
             self.image_frame.pack(fill=tk.X, pady=5)
-        self.update_preview()
+        self.schedule_preview_update()
+    
+    def on_text_changed(self):
+        """水印文本改变，文本未变化时不刷新预览"""
+        text = self.text_content.get()
+        if text == self._last_watermark_text:
+            return
+        self._last_watermark_text = text
+        self.schedule_preview_update()
     
     def on_format_change(self, event=None):
         """输出格式改变"""
-        if self.output_format.get() == "JPEG":
+        output_format = self.output_format.get()
+        if output_format == self._last_output_format:
+            return
+        self._last_output_format = output_format
+        
+        if output_format == "JPEG":
             self.jpeg_frame.grid(row=1, column=0, columnspan=2, sticky=tk.W, padx=5, pady=2)
         else:
             self.jpeg_frame.grid_forget()
@@ -453,24 +768,64 @@ class CompleteWatermarkApp:
         """字体大小改变"""
         size = int(float(value))
         self.font_size_label.config(text=str(size))
-        self.update_preview()
+        self.schedule_preview_update()
     
     def on_opacity_change(self, value):
         """透明度改变"""
         opacity = int(float(value))
         self.opacity_label.config(text=f"{opacity}%")
-        self.update_preview()
+        self.schedule_preview_update()
     
     def on_image_scale_change(self, value):
         """图片缩放改变"""
         scale = int(float(value))
         self.image_scale_label.config(text=f"{scale}%")
-        self.update_preview()
+        self.schedule_preview_update()
     
     def on_rotation_change(self, value):
         """旋转角度改变"""
         rotation = int(float(value))
         self.rotation_label.config(text=f"{rotation}°")
+        self.schedule_preview_update()
+    
+    def schedule_scrollregion_update(self, canvas, delay=50):
+        """合并连续的<Configure>事件，每个间隔内只计算一次滚动区域"""
+        if self._pending_scrollregion is None:
+            self._pending_scrollregion = self.root.after(delay, self._update_scrollregion, canvas)
+    
+    def _update_scrollregion(self, canvas):
+        """重新计算滚动区域，未变化时不重新配置画布"""
+        self._pending_scrollregion = None
+        region = canvas.bbox("all")
+        if region != self._last_scrollregion:
+            self._last_scrollregion = region
+            canvas.configure(scrollregion=region)
+    
+    def on_preview_canvas_resize(self, event):
+        """记录预览画布尺寸，之前尺寸下缓存的预览图不再可用"""
+        size = (event.width, event.height)
+        if size != self._canvas_size:
+            self._canvas_size = size
+            self._preview_cache.clear()
+            self.schedule_preview_update()
+    
+    def on_window_map(self, event):
+        """窗口重新显示时补上被跳过的预览刷新"""
+        if self._preview_dirty:
+            self._preview_dirty = False
+            self.schedule_preview_update()
+    
+    def schedule_preview_update(self, delay=80):
+        """延迟刷新预览，连续触发时只执行最后一次"""
+        if self._preview_suspended:
+            return
+        if self._pending_render:
+            self.root.after_cancel(self._pending_render)
+        self._pending_render = self.root.after(delay, self._do_preview_update)
+    
+    def _do_preview_update(self):
+        """执行延迟的预览刷新"""
+        self._pending_render = None
         self.update_preview()
     
     def on_jpeg_quality_change(self, value):
@@ -480,14 +835,18 @@ class CompleteWatermarkApp:
     
     def on_position_changed(self):
         """位置改变事件处理"""
+        # 再次点击当前预设位置时无需刷新
+        if self.watermark_position is None and self.position.get() == self._last_position:
+            return
+        
         # 重置手动位置
         self.watermark_position = None
-        self.update_preview()
+        self.schedule_preview_update()
     
     def reset_watermark_position(self):
         """重置水印位置"""
         self.watermark_position = None
-        self.update_preview()
+        self.schedule_preview_update()
     
     def choose_color(self):
         """选择字体颜色"""
@@ -495,7 +854,7 @@ class CompleteWatermarkApp:
         if color[1]:
             self.font_color.set(color[1])
             self.color_button.config(bg=color[1])
-            self.update_preview()
+            self.schedule_preview_update()
     
     def choose_effect_color(self):
         """选择效果颜色（阴影/描边）"""
@@ -503,7 +862,7 @@ class CompleteWatermarkApp:
         if color[1]:
             self.effect_color.set(color[1])
             self.effect_color_button.config(bg=color[1])
-            self.update_preview()
+            self.schedule_preview_update()
     
     def choose_watermark_image(self):
         """选择水印图片"""
@@ -513,19 +872,17 @@ class CompleteWatermarkApp:
         )
         if file_path:
             self.watermark_image_path.set(file_path)
-            self.update_preview()
+            self.schedule_preview_update()
     
     def on_image_select(self, event):
         """图片选择事件"""
         selection = self.image_tree.selection()
         if selection:
-            item = selection[0]
-            # 获取选中项的索引
-            for i, image_info in enumerate(self.loaded_images):
-                if self.image_tree.item(item)['values'][0] == image_info['name']:
-                    self.current_image_index = i
-                    break
-            self.update_preview()
+            # 按行ID直接查出索引，无需逐行读取列表内容比较文件名
+            index = self._item_to_index.get(selection[0])
+            if index is not None:
+                self.current_image_index = index
+            self.schedule_preview_update()
     
     def on_canvas_click(self, event):
         """画布点击事件"""
@@ -536,8 +893,7 @@ class CompleteWatermarkApp:
     def on_canvas_drag(self, event):
         """画布拖拽事件"""
         if self.dragging_watermark and self.loaded_images:
-            canvas_width = self.preview_canvas.winfo_width()
-            canvas_height = self.preview_canvas.winfo_height()
+            canvas_width, canvas_height = self._canvas_size
             
             # 计算相对位置
             rel_x = event.x / canvas_width
@@ -548,7 +904,9 @@ class CompleteWatermarkApp:
             rel_y = max(0, min(1, rel_y))
             
             self.watermark_position = (rel_x, rel_y)
-            self.update_preview()
+            # 拖动过程中不取消已排队的刷新，保证持续拖动时预览按固定间隔跟随
+            if self._pending_render is None:
+                self.schedule_preview_update(40)
     
     def on_canvas_release(self, event):
         """画布释放事件"""
@@ -568,127 +926,446 @@ class CompleteWatermarkApp:
         """导入文件夹"""
         folder = filedialog.askdirectory(title="选择包含图片的文件夹")
         if folder:
-            image_files = []
-            for root, dirs, files in os.walk(folder):
-                for file in files:
-                    if file.lower().endswith(('.png', '.jpg', '.jpeg', '.bmp', '.tiff', '.gif')):
-                        image_files.append(os.path.join(root, file))
+            self.load_images_to_list(self.image_processor.iter_image_files(folder),
+                                     empty_message="文件夹中没有找到图片文件")
+    
+    def load_images_to_list(self, file_paths, empty_message=None):
+        """
+        加载图片到列表（跳过已导入的文件，按目录顺序读取）
+        file_paths可以是惰性的文件夹遍历，扫描和读取文件头都在后台线程中进行，界面保持响应
+        empty_message为没有找到任何图片文件时显示的提示
+        """
+        self._pending_loads += 1
+        threading.Thread(target=self._load_images_worker, args=(file_paths, empty_message),
+                         daemon=True).start()
+        if not self._load_polling:
+            self._load_polling = True
+            self.root.after(50, self.poll_loaded_images)
+    
+    def _load_images_worker(self, file_paths, empty_message):
+        """后台线程：扫描路径并读取文件头，结果分批放入队列"""
+        found = False
+        try:
+            file_paths = list(file_paths)
+            found = bool(file_paths)
+            # 去重并按(目录, 文件名)排序，同一目录的文件连续读取，磁盘缓存命中率更高
+            new_paths = sorted(
+                {p for p in file_paths if p not in self._loaded_paths},
+                key=lambda p: (os.path.dirname(p), os.path.basename(p))
+            )
+            self._load_queue.put(('total', len(new_paths)))
             
-            if image_files:
-                self.load_images_to_list(image_files)
-            else:
-                messagebox.showinfo("提示", "文件夹中没有找到图片文件")
+            # 只读取文件头，各文件相互独立，在线程池中并行读取（结果保持原顺序）
+            batch = []
+            reported = 0
+            for done, image_info in enumerate(
+                    self._thumb_pool.map(self.image_processor.load_image, new_paths), 1):
+                if image_info:
+                    batch.append(image_info)
+                if done - reported >= self.LOAD_BATCH_SIZE or done == len(new_paths):
+                    # 同时交回本批读取的文件数，用于显示进度
+                    self._load_queue.put(('images', (batch, done - reported)))
+                    batch = []
+                    reported = done
+        except Exception as e:
+            print(f"导入图片失败: {e}")
+        self._load_queue.put(('done', None if found else empty_message))
     
-    def load_images_to_list(self, file_paths):
-        """加载图片到列表"""
-        for file_path in file_paths:
+    def poll_loaded_images(self):
+        """在主线程取出后台读取完成的图片追加到列表，并在预览信息栏显示导入进度"""
+        while True:
             try:
-                image_info = self.image_processor.load_image(file_path)
-                if image_info:
-                    self.loaded_images.append(image_info)
-            except Exception as e:
-                print(f"加载图片失败 {file_path}: {e}")
+                kind, value = self._load_queue.get_nowait()
+            except queue.Empty:
+                break
+            
+            if kind == 'total':
+                self._load_total += value
+            elif kind == 'images':
+                image_infos, count = value
+                self._load_done += count
+                start = len(self.loaded_images)
+                for image_info in image_infos:
+                    # 同时进行的导入可能包含相同的文件
+                    if image_info['path'] not in self._loaded_paths:
+                        self.loaded_images.append(image_info)
+                        self._loaded_paths.add(image_info['path'])
+                
+                # 已有的行和缩略图保持不变，只追加新导入的图片
+                if len(self.loaded_images) > start:
+                    self.update_image_list(start)
+                    if start == 0:
+                        self.current_image_index = 0
+                        self.schedule_preview_update()
+            else:  # done
+                self._pending_loads -= 1
+                if value:
+                    messagebox.showinfo("提示", value)
+        
+        if self._pending_loads > 0:
+            self.preview_info.config(text=f"正在导入图片 {self._load_done}/{self._load_total}")
+            self.root.after(50, self.poll_loaded_images)
+            return
         
-        self.update_image_list()
+        self._load_polling = False
+        self._load_total = self._load_done = 0
         if self.loaded_images:
-            self.current_image_index = 0
-            self.update_preview()
+            self.schedule_preview_update()
+    
+    def update_image_list(self, start=0):
+        """
+        更新图片列表显示
+        start为0时重建整个列表，否则保留已有的行，只追加尚未显示的新图片
+        """
+        if start == 0:
+            # 清空现有项目（一次调用删除全部），之前尚未完成的缩略图任务结果将被丢弃
+            self.image_tree.delete(*self.image_tree.get_children())
+            self.thumbnail_refs.clear()
+            self._thumb_requested.clear()
+            self._thumb_generation += 1
+            self._tree_items = []
+            self._item_to_index.clear()
+        
+        # 行分批插入，批次之间事件循环可以处理重绘和用户操作
+        if not self._tree_inserting:
+            self._tree_inserting = True
+            self._insert_tree_chunk()
+    
+    def _insert_tree_chunk(self):
+        """插入一批尚未显示的图片行，还有剩余时在下一轮事件循环中继续"""
+        start = len(self._tree_items)
+        end = min(start + self.TREE_INSERT_CHUNK, len(self.loaded_images))
+        
+        # 只插入文本行，缩略图由request_visible_thumbnails按可见范围生成
+        items = self._bulk_insert(
+            (image_info['name'], 
+             f"{image_info['size'][0]}x{image_info['size'][1]}", 
+             image_info['format'])
+            for image_info in self.loaded_images[start:end]
+        )
+        self._tree_items.extend(items)
+        self._item_to_index.update(zip(items, range(start, end)))
+        self.request_visible_thumbnails(*self.image_tree.yview())
+        
+        if end < len(self.loaded_images):
+            self.root.after(1, self._insert_tree_chunk)
+        else:
+            self._tree_inserting = False
+    
+    def _bulk_insert(self, rows):
+        """批量插入列表行，插入期间隐藏数据列以跳过逐行的列宽布局"""
+        display_columns = self.image_tree['displaycolumns']
+        self.image_tree.configure(displaycolumns=())
+        try:
+            return [self.image_tree.insert('', 'end', values=values) for values in rows]
+        finally:
+            self.image_tree.configure(displaycolumns=display_columns)
     
-    def update_image_list(self):
-        """更新图片列表显示"""
-        # 清空现有项目
-        for item in self.image_tree.get_children():
-            self.image_tree.delete(item)
+    def on_image_list_scroll(self, first, last):
+        """列表滚动时同步滚动条，并为新进入可见范围的行生成缩略图"""
+        self.tree_scroll.set(first, last)
+        self.request_visible_thumbnails(first, last)
+    
+    def request_visible_thumbnails(self, first, last):
+        """
+        为可见行及其前后缓冲区的行生成缩略图
+        远离可见范围的缩略图被释放，PhotoImage数量只与可见行数有关
+        """
+        count = len(self._tree_items)
+        if not count:
+            return
         
-        # 添加图片项目
-        for i, image_info in enumerate(self.loaded_images):
+        start = max(0, int(float(first) * count) - self.THUMB_BUFFER_ROWS)
+        end = min(count, int(float(last) * count) + 1 + self.THUMB_BUFFER_ROWS)
+        
+        # 释放远离可见范围的缩略图
+        keep_start = start - self.THUMB_KEEP_ROWS
+        keep_end = end + self.THUMB_KEEP_ROWS
+        for i in [i for i in self._thumb_requested if i < keep_start or i >= keep_end]:
+            self._thumb_requested.discard(i)
+            if self.thumbnail_refs.pop(i, None) is not None:
+                self.image_tree.item(self._tree_items[i], image='')
+        
+        generation = self._thumb_generation
+        for i in range(start, end):
+            if i in self._thumb_requested:
+                continue
+            self._thumb_requested.add(i)
+            future = self._thumb_pool.submit(load_cached_thumbnail, self.loaded_images[i]['path'], (64, 64))
+            future.add_done_callback(
+                lambda f, i=i: self._thumb_queue.put((generation, i, f))
+            )
+            self._pending_thumbs += 1
+        
+        if self._pending_thumbs and not self._thumb_polling:
+            self._thumb_polling = True
+            self.root.after(30, self.apply_ready_thumbnails)
+    
+    def apply_ready_thumbnails(self):
+        """在主线程中把已生成的缩略图设置到列表（PhotoImage只能在主线程创建）"""
+        while True:
             try:
-                # 创建缩略图
-                thumbnail = self.create_thumbnail(image_info['image'])
+                generation, i, future = self._thumb_queue.get_nowait()
+            except queue.Empty:
+                break
+            
+            self._pending_thumbs -= 1
+            # 列表已重建或该行已移出可见范围
+            if generation != self._thumb_generation or i not in self._thumb_requested:
+                continue
+            
+            try:
+                thumbnail = future.result()
                 if thumbnail:
                     # 保存缩略图引用
-                    self.thumbnail_refs[i] = thumbnail
-                    
-                    # 插入到树形视图
-                    item_id = self.image_tree.insert('', 'end',
-                                                    image=thumbnail,
-                                                    values=(image_info['name'], 
-                                                           f"{image_info['size'][0]}x{image_info['size'][1]}", 
-                                                           image_info['format']))
-                else:
-                    # 没有缩略图的情况
-                    self.image_tree.insert('', 'end',
-                                          values=(image_info['name'], 
-                                                 f"{image_info['size'][0]}x{image_info['size'][1]}", 
-                                                 image_info['format']))
+                    photo = ImageTk.PhotoImage(thumbnail)
+                    self.thumbnail_refs[i] = photo
+                    self.image_tree.item(self._tree_items[i], image=photo)
             except Exception as e:
                 print(f"创建缩略图失败: {e}")
-                # 添加无缩略图的项目
-                self.image_tree.insert('', 'end',
-                                      values=(image_info['name'], 
-                                             f"{image_info['size'][0]}x{image_info['size'][1]}", 
-                                             image_info['format']))
-    
-    def create_thumbnail(self, image):
-        """创建缩略图"""
-        try:
-            # 创建64x64的缩略图
-            thumbnail = image.copy()
-            thumbnail.thumbnail((64, 64), Image.Resampling.LANCZOS)
-            
-            # 转换为PhotoImage
-            photo = ImageTk.PhotoImage(thumbnail)
-            return photo
-        except Exception as e:
-            print(f"创建缩略图失败: {e}")
-            return None
+        
+        if self._pending_thumbs > 0:
+            self.root.after(30, self.apply_ready_thumbnails)
+        else:
+            self._thumb_polling = False
     
     def update_preview(self):
-        """更新预览"""
+        """
+        更新预览
+        设置和水印在主线程读取和创建，底图缩放与水印合成交给后台渲染线程
+        """
+        settings = self._settings
+        self._last_position = settings['position']
         if not self.loaded_images:
             return
         
+        # 窗口最小化或预览区不可见时不渲染，等窗口重新显示后再刷新
+        if self.root.state() == 'iconic' or not self.preview_canvas.winfo_viewable():
+            self._preview_dirty = True
+            return
+        self._preview_dirty = False
+        
         try:
             current_image = self.loaded_images[self.current_image_index]
-            base_image = current_image['image'].copy()
+            
+            # 图片和水印设置都未变化时（如切换回之前的图片）直接显示缓存的预览图
+            cache_key = self._preview_cache_key(current_image)
+            cached = self._preview_cache.get(cache_key)
+            if cached is not None:
+                self._preview_cache.move_to_end(cache_key)
+                self._latest_render_key = None  # 仍在渲染中的旧预览不再显示
+                self.display_preview(cached)
+                self.show_preview_info(current_image)
+                return
+            
+            canvas_width, canvas_height = self._canvas_size
+            if canvas_width <= 1 or canvas_height <= 1:
+                return
             
             # 创建水印
             watermark = None
-            if self.watermark_type.get() == "text":
+            if settings['watermark_type'] == "text":
                 # 文本水印
                 watermark = self.create_text_watermark()
-            elif self.watermark_type.get() == "image" and self.watermark_image_path.get():
+            elif settings['watermark_type'] == "image" and settings['watermark_image_path']:
                 # 图片水印
                 watermark = self.create_image_watermark()
             
-            if watermark:
-                # 应用水印
-                preview_image = self.apply_watermark_to_image(base_image, watermark)
-            else:
-                preview_image = base_image
+            request = (
+                cache_key, current_image,
+                (canvas_width - 20, canvas_height - 20),
+                (self.root.winfo_screenwidth(), self.root.winfo_screenheight()),
+                watermark, settings['rotation'], self.watermark_position,
+                _POS_TABLE.get(settings['position'], WatermarkPosition.BOTTOM_RIGHT),
+                # 下一张图片，渲染线程空闲时预先生成其预览金字塔
+                self.loaded_images[(self.current_image_index + 1) % len(self.loaded_images)],
+            )
+            self._latest_render_key = cache_key
             
-            # 显示预览
-            self.display_preview(preview_image)
+            # 队列只保留最新的请求，渲染线程尚未取走的旧请求直接丢弃
+            try:
+                self._render_queue.get_nowait()
+            except queue.Empty:
+                pass
+            self._render_queue.put_nowait(request)
             
-            # 更新信息
-            info_text = f"{current_image['name']} - {current_image['size'][0]}x{current_image['size'][1]} - {current_image['format']}"
-            self.preview_info.config(text=info_text)
+            if not self._render_polling:
+                self._render_polling = True
+                self.root.after(30, self.apply_rendered_preview)
         
         except Exception as e:
             print(f"更新预览失败: {str(e)}")
     
+    def _render_loop(self):
+        """后台渲染线程：先把原图缩小到画布尺寸，再在小图上合成水印，结果经队列交回主线程"""
+        while True:
+            request = self._render_queue.get()
+            (cache_key, image_info, max_size, screen_size, watermark, rotation, rel_pos, position,
+             next_info) = request
+            try:
+                base_image = self.get_preview_base(image_info, max_size, screen_size)
+                if watermark:
+                    # 水印和边距按底图的缩小比例同步缩放，保持与导出结果一致
+                    scale = base_image.width / image_info['size'][0]
+                    preview_image = self.apply_watermark_to_image(
+                        base_image, watermark, rotation, rel_pos, position, scale
+                    )
+                    # 不透明底图合成后alpha全为255，转回RGB后主线程写入PhotoImage时无需处理透明度
+                    if preview_image.mode == 'RGBA' and base_image.mode != 'RGBA':
+                        preview_image = preview_image.convert('RGB')
+                else:
+                    preview_image = base_image
+            except Exception as e:
+                print(f"更新预览失败: {str(e)}")
+                preview_image = None
+            self._rendered_queue.put((cache_key, image_info, preview_image))
+            
+            # 没有新的请求时预先解码缩小下一张图片，切换图片时直接命中金字塔缓存
+            if next_info is not image_info and self._render_queue.empty():
+                try:
+                    self.get_preview_pyramid(next_info, screen_size)
+                except Exception as e:
+                    print(f"预先生成预览失败: {e}")
+    
+    def apply_rendered_preview(self):
+        """在主线程显示渲染完成的预览图，最新的请求尚未完成时继续定时检查"""
+        while True:
+            try:
+                cache_key, image_info, preview_image = self._rendered_queue.get_nowait()
+            except queue.Empty:
+                break
+            
+            if cache_key != self._latest_render_key:
+                continue
+            self._latest_render_key = None
+            if preview_image is None:
+                continue
+            
+            display_image = self.display_preview(preview_image)
+            if display_image is not None:
+                self._preview_cache[cache_key] = display_image
+                if len(self._preview_cache) > self.PREVIEW_CACHE_SIZE:
+                    self._preview_cache.popitem(last=False)
+            self.show_preview_info(image_info)
+        
+        if self._latest_render_key is not None:
+            self.root.after(30, self.apply_rendered_preview)
+        else:
+            self._render_polling = False
+    
+    def get_preview_base(self, image_info, max_size, screen_size):
+        """
+        获取图片缩小到max_size以内的预览底图，画布尺寸变化或切换图片时重新生成
+        从预览金字塔中选取不小于画布的最小一级再缩放，无需每次从原图缩小
+        只在渲染线程中调用
+        """
+        cached = self._preview_base
+        if cached is not None and cached[0] == image_info['path'] and cached[1] == max_size:
+            return cached[2]
+        
+        levels = self.get_preview_pyramid(image_info, screen_size)
+        source = levels[0]
+        for level in levels[1:]:
+            if level.width < max_size[0] and level.height < max_size[1]:
+                break
+            source = level
+        
+        base_image = resize_for_display(source, max_size)
+        self._preview_base = (image_info['path'], max_size, base_image)
+        return base_image
+    
+    def get_preview_pyramid(self, image_info, screen_size):
+        """
+        获取图片的预览金字塔：第一级缩小到屏幕尺寸，之后每级宽高减半，直到最长边小于512像素
+        原图尚未解码时直接从文件按屏幕尺寸缩小解码
+        """
+        path = image_info['path']
+        levels = self._pyramid_cache.get(path)
+        if levels is not None:
+            self._pyramid_cache.move_to_end(path)
+            return levels
+        
+        source = image_info.get('image')
+        level = resize_for_display(source if source is not None else path, screen_size)
+        levels = [level]
+        while max(level.size) >= 512:
+            level = level.reduce(2)
+            levels.append(level)
+        
+        self._pyramid_cache[path] = levels
+        if len(self._pyramid_cache) > self.PYRAMID_CACHE_SIZE:
+            self._pyramid_cache.popitem(last=False)
+        return levels
+    
+    def _preview_cache_key(self, image_info):
+        """预览缓存键：图片、画布尺寸以及所有影响水印外观的设置"""
+        return (image_info['path'], self._canvas_size, *self._settings.values(), self.watermark_position)
+    
+    def watch_preview_vars(self):
+        """为影响预览的变量登记写入回调，维护设置快照，预览时无需逐个读取Tk变量"""
+        self._settings = {}
+        for name in self.PREVIEW_VARS:
+            getattr(self, name).trace_add('write', lambda *args, name=name: self._sync_setting(name))
+            self._sync_setting(name)
+    
+    def _sync_setting(self, name):
+        """把变量的当前值写入设置快照（输入不完整无法解析时保留原值）"""
+        try:
+            self._settings[name] = getattr(self, name).get()
+        except tk.TclError:
+            pass
+    
+    def show_preview_info(self, image_info):
+        """更新预览信息栏"""
+        info_text = f"{image_info['name']} - {image_info['size'][0]}x{image_info['size'][1]} - {image_info['format']}"
+        self.preview_info.config(text=info_text)
+    
     def create_text_watermark(self):
-        """创建文本水印 - 支持粗体、斜体和样式增强"""
+        """
+        创建文本水印 - 支持粗体、斜体和样式增强
+        文字按不透明度100%渲染并缓存，只有透明度变化时（如拖动透明度滑块）直接缩放缓存图块的alpha通道
+        应用透明度后的结果同样缓存，设置未变时直接返回同一图像（调用方不得修改返回的图像）
+        """
+        settings = self._settings
+        key = (settings['text_content'], settings['font_family'], settings['font_size'],
+               settings['font_bold'], settings['font_italic'], settings['font_color'],
+               settings['text_shadow'], settings['text_outline'], settings['effect_color'])
+        wm_key = (key, settings['opacity'])
+        watermark = self._wm_cache.get(wm_key)
+        if watermark is not None:
+            self._wm_cache.move_to_end(wm_key)
+            return watermark
+        
+        tile = self._text_tile_cache.get(key)
+        if tile is None:
+            tile = self.render_text_tile()
+            if tile is None:
+                return None
+            self._text_tile_cache[key] = tile
+            if len(self._text_tile_cache) > self.TEXT_TILE_CACHE_SIZE:
+                self._text_tile_cache.popitem(last=False)
+        else:
+            self._text_tile_cache.move_to_end(key)
+        
+        watermark = tile.copy()
+        opacity = int(255 * settings['opacity'] / 100)
+        if opacity < 255:
+            alpha_table = [a * opacity // 255 for a in range(256)]
+            watermark.putalpha(tile.getchannel('A').point(alpha_table))
+        
+        self._wm_cache[wm_key] = watermark
+        if len(self._wm_cache) > self.WM_CACHE_SIZE:
+            self._wm_cache.popitem(last=False)
+        return watermark
+    
+    def render_text_tile(self):
+        """按当前文字样式渲染不透明的文字水印图块"""
         try:
             # 获取字体 - 支持粗体和斜体
             font = self.get_styled_font()
             
-            # 创建临时图像来测量文本大小
-            temp_img = Image.new('RGBA', (2000, 2000))
-            draw = ImageDraw.Draw(temp_img)
-            
-            # 使用textbbox获取准确的文本边界
-            bbox = draw.textbbox((0, 0), self.text_content.get(), font=font)
+            # 直接从字体度量获取准确的文本边界，无需创建临时图像
+            bbox = font.getbbox(self.text_content.get())
             text_width = bbox[2] - bbox[0]
             text_height = bbox[3] - bbox[1]
             
@@ -702,8 +1379,8 @@ class CompleteWatermarkApp:
             watermark = Image.new('RGBA', (watermark_width, watermark_height), (0, 0, 0, 0))
             draw = ImageDraw.Draw(watermark)
             
-            # 解析主文本颜色和透明度
-            text_color = self.parse_color_with_opacity(self.font_color.get(), self.opacity.get())
+            # 解析主文本颜色（透明度由create_text_watermark统一应用）
+            text_color = self.parse_color_with_opacity(self.font_color.get(), 100)
             
             # 计算文本位置
             text_x = margin - bbox[0]
@@ -711,10 +1388,10 @@ class CompleteWatermarkApp:
             
             # 绘制样式增强效果
             if self.text_shadow.get():
-                self.draw_text_shadow(draw, text_x, text_y, font)
+                self.draw_text_shadow(draw, text_x, text_y, font, 100)
             
             if self.text_outline.get():
-                self.draw_text_outline(draw, text_x, text_y, font)
+                self.draw_text_outline(draw, text_x, text_y, font, 100)
             
             # 绘制主文本
             draw.text((text_x, text_y), self.text_content.get(), font=font, fill=text_color)
@@ -728,36 +1405,8 @@ class CompleteWatermarkApp:
     def get_styled_font(self):
         """获取带样式的字体（支持粗体、斜体）"""
         try:
-            font_name = self.font_family.get()
-            font_size = self.font_size.get()
-            
-            # 尝试根据样式选择字体文件
-            if self.font_bold.get() and self.font_italic.get():
-                # 粗斜体
-                font_variants = [f"{font_name} Bold Italic", f"{font_name}-BoldItalic", f"{font_name}BI"]
-            elif self.font_bold.get():
-                # 粗体
-                font_variants = [f"{font_name} Bold", f"{font_name}-Bold", f"{font_name}B"]
-            elif self.font_italic.get():
-                # 斜体
-                font_variants = [f"{font_name} Italic", f"{font_name}-Italic", f"{font_name}I"]
-            else:
-                # 常规
-                font_variants = [font_name]
-            
-            # 尝试加载字体变体
-            for variant in font_variants:
-                try:
-                    return ImageFont.truetype(variant, font_size)
-                except:
-                    continue
-            
-            # 如果找不到样式字体，使用基础字体并通过其他方式模拟
-            try:
-                return ImageFont.truetype(font_name, font_size)
-            except:
-                return ImageFont.load_default()
-                
+            return _load_styled_font(self.font_family.get(), self.font_size.get(),
+                                     self.font_bold.get(), self.font_italic.get())
         except Exception as e:
             print(f"加载字体失败: {e}")
             return ImageFont.load_default()
@@ -775,52 +1424,65 @@ class CompleteWatermarkApp:
         
         return (r, g, b, opacity)
     
-    def draw_text_shadow(self, draw, x, y, font):
+    def draw_text_shadow(self, draw, x, y, font, opacity_percent):
         """绘制文本阴影"""
-        shadow_color = self.parse_color_with_opacity(self.effect_color.get(), self.opacity.get())
+        shadow_color = self.parse_color_with_opacity(self.effect_color.get(), opacity_percent)
         shadow_offset = max(2, int(self.font_size.get() * 0.05))
         
         # 绘制阴影（向右下偏移）
         draw.text((x + shadow_offset, y + shadow_offset), 
                  self.text_content.get(), font=font, fill=shadow_color)
     
-    def draw_text_outline(self, draw, x, y, font):
+    def draw_text_outline(self, draw, x, y, font, opacity_percent):
         """绘制文本描边"""
-        outline_color = self.parse_color_with_opacity(self.effect_color.get(), self.opacity.get())
+        outline_color = self.parse_color_with_opacity(self.effect_color.get(), opacity_percent)
         outline_width = max(1, int(self.font_size.get() * 0.03))
         
-        # 绘制描边（8个方向）
-        for dx in range(-outline_width, outline_width + 1):
-            for dy in range(-outline_width, outline_width + 1):
-                if dx != 0 or dy != 0:
-                    draw.text((x + dx, y + dy), 
-                             self.text_content.get(), font=font, fill=outline_color)
+        # 绘制描边（由PIL一次完成，无需逐方向重复绘制）
+        draw.text((x, y), self.text_content.get(), font=font, fill=outline_color,
+                 stroke_width=outline_width, stroke_fill=outline_color)
     
     def create_image_watermark(self):
-        """创建图片水印"""
+        """
+        创建图片水印
+        解码并缩放后的水印图片按(路径, 修改时间, 缩放)缓存，预览刷新和导出时不再重复读取文件
+        """
         try:
-            watermark_path = self.watermark_image_path.get()
-            if not os.path.exists(watermark_path):
+            settings = self._settings
+            watermark_path = settings['watermark_image_path']
+            try:
+                mtime = os.stat(watermark_path).st_mtime_ns
+            except OSError:
                 return None
             
-            # 加载水印图片
-            watermark = Image.open(watermark_path)
-            
-            # 确保有透明通道
-            if watermark.mode != 'RGBA':
-                watermark = watermark.convert('RGBA')
+            key = (watermark_path, mtime, settings['image_scale'])
+            scaled = self._image_wm_cache.get(key)
+            if scaled is None:
+                # 加载水印图片
+                with Image.open(watermark_path) as source:
+                    # 确保有透明通道
+                    scaled = source.convert('RGBA')
+                
+                # 调整大小
+                scale = settings['image_scale'] / 100.0
+                new_size = (int(scaled.width * scale), int(scaled.height * scale))
+                scaled = scaled.resize(new_size, Image.Resampling.LANCZOS)
+                
+                self._image_wm_cache[key] = scaled
+                if len(self._image_wm_cache) > self.IMAGE_WM_CACHE_SIZE:
+                    self._image_wm_cache.popitem(last=False)
+            else:
+                self._image_wm_cache.move_to_end(key)
             
-            # 调整大小
-            scale = self.image_scale.get() / 100.0
-            new_size = (int(watermark.width * scale), int(watermark.height * scale))
-            watermark = watermark.resize(new_size, Image.Resampling.LANCZOS)
+            watermark = scaled.copy()
             
             # 调整透明度
-            opacity = self.opacity.get() / 100.0
+            opacity = settings['opacity'] / 100.0
             if opacity < 1.0:
                 # 创建透明度蒙版
-                alpha = watermark.split()[-1]
-                alpha = alpha.point(lambda p: int(p * opacity))
+                alpha = watermark.getchannel('A')
+                lut = [int(p * opacity) for p in range(256)]
+                alpha = alpha.point(lut)
                 watermark.putalpha(alpha)
             
             return watermark
@@ -829,79 +1491,72 @@ class CompleteWatermarkApp:
             print(f"创建图片水印失败: {e}")
             return None
     
-    def apply_watermark_to_image(self, base_image, watermark):
-        """将水印应用到图片上 - 修复版"""
+    def apply_watermark_to_image(self, base_image, watermark, rotation, rel_pos, position, scale=1.0):
+        """
+        将水印应用到图片上 - 修复版
+        设置由调用方传入（不读取Tk变量），可在渲染线程中调用
+        scale为base_image相对原图的缩放比例，预览在缩小的底图上合成时水印和边距同步缩放
+        """
         try:
-            # 确保基础图像有透明通道
-            if base_image.mode != 'RGBA':
-                base_image = base_image.convert('RGBA')
-            
-            # 旋转水印
-            rotation_angle = self.rotation.get()
-            if rotation_angle != 0:
-                watermark = watermark.rotate(rotation_angle, expand=True, fillcolor=(0, 0, 0, 0))
+            margin = 20 if scale >= 1.0 else round(20 * scale)
             
-            # 计算水印位置
-            if self.watermark_position:
-                # 手动位置
-                x = int(self.watermark_position[0] * base_image.width - watermark.width / 2)
-                y = int(self.watermark_position[1] * base_image.height - watermark.height / 2)
+            # 拖动水印位置时水印本身不变，直接复用上次缩放旋转的结果
+            prepared = self._prepared_wm
+            if prepared is not None and prepared[0] is watermark and prepared[1:3] == (scale, rotation):
+                watermark = prepared[3]
             else:
-                # 预设位置 - 修复位置计算
-                margin = 20
-                position_map = {
-                    '左上': (margin, margin),
-                    '上中': (base_image.width // 2 - watermark.width // 2, margin),
-                    '右上': (base_image.width - watermark.width - margin, margin),
-                    '左中': (margin, base_image.height // 2 - watermark.height // 2),
-                    '中心': (base_image.width // 2 - watermark.width // 2, base_image.height // 2 - watermark.height // 2),
-                    '右中': (base_image.width - watermark.width - margin, base_image.height // 2 - watermark.height // 2),
-                    '左下': (margin, base_image.height - watermark.height - margin),
-                    '下中': (base_image.width // 2 - watermark.width // 2, base_image.height - watermark.height - margin),
-                    '右下': (base_image.width - watermark.width - margin, base_image.height - watermark.height - margin)
-                }
-                x, y = position_map.get(self.position.get(), position_map['右下'])
-            
-            # 确保位置在图片范围内
-            x = max(0, min(x, base_image.width - watermark.width))
-            y = max(0, min(y, base_image.height - watermark.height))
-            
-            # 粘贴水印
-            result = base_image.copy()
-            result.paste(watermark, (x, y), watermark)
+                source = watermark
+                if scale < 1.0:
+                    size = (max(1, round(watermark.width * scale)), max(1, round(watermark.height * scale)))
+                    watermark = watermark.resize(size, Image.Resampling.BILINEAR)
+                
+                # 旋转水印
+                if rotation != 0:
+                    watermark = self.watermark_processor.rotate_watermark(watermark, rotation)
+                self._prepared_wm = (source, scale, rotation, watermark)
             
-            return result
+            # 按手动位置或预设位置贴上水印
+            return _paste_watermark(base_image, watermark, rel_pos, position,
+                                    self.watermark_processor, margin)
             
         except Exception as e:
             print(f"应用水印失败: {e}")
             return base_image
     
     def display_preview(self, image):
-        """显示预览图片"""
+        """显示预览图片，返回缩放到画布尺寸后的图片（画布尚未显示时返回None）"""
         try:
             # 调整预览大小
-            canvas_width = self.preview_canvas.winfo_width()
-            canvas_height = self.preview_canvas.winfo_height()
+            canvas_width, canvas_height = self._canvas_size
             
             if canvas_width > 1 and canvas_height > 1:
                 display_image = resize_for_display(image, (canvas_width - 20, canvas_height - 20))
                 
-                # 创建PhotoImage并保存引用
-                photo = ImageTk.PhotoImage(display_image)
-                self.image_refs.append(photo)
-                
-                # 限制引用数量
-                if len(self.image_refs) > 10:
-                    self.image_refs = self.image_refs[-5:]
+                photo = self._preview_photo
+                photo_key = (display_image.size, display_image.mode)
+                if photo is not None and photo_key == self._preview_photo_key:
+                    # 尺寸和模式未变，直接把新内容写入已有的PhotoImage（模式不同时paste会在主线程转换）
+                    photo.paste(display_image)
+                else:
+                    photo = ImageTk.PhotoImage(display_image)
+                    self._preview_photo = photo
+                    self._preview_photo_key = photo_key
                 
-                # 清空画布并显示图片
-                self.preview_canvas.delete("all")
-                self.preview_canvas.create_image(
-                    canvas_width // 2, canvas_height // 2,
-                    image=photo, anchor=tk.CENTER
-                )
+                # 画布图像项只创建一次，之后只在需要时更新图像和位置
+                center = (canvas_width // 2, canvas_height // 2)
+                if self._preview_item is None:
+                    self._preview_item = self.preview_canvas.create_image(
+                        *center, image=photo, anchor=tk.CENTER
+                    )
+                else:
+                    self.preview_canvas.itemconfig(self._preview_item, image=photo)
+                    if center != self._preview_center:
+                        self.preview_canvas.coords(self._preview_item, *center)
+                self._preview_center = center
+                return display_image
         except Exception as e:
             print(f"显示预览失败: {e}")
+        return None
     
     def export_current(self):
         """导出当前图片 - 修复版"""
@@ -922,11 +1577,28 @@ class CompleteWatermarkApp:
             messagebox.showerror("错误", "为防止覆盖原图，不能导出到原文件夹！\n请选择其他文件夹。")
             return
         
+        # 水印在主线程创建，编码和写入文件在后台线程中进行，界面保持响应
         try:
-            self.export_single_image(current_image, output_dir)
-            messagebox.showinfo("成功", "图片导出成功！")
+            future = self._thumb_pool.submit(_export_job, self.create_export_job(current_image, output_dir))
         except Exception as e:
             messagebox.showerror("错误", f"导出失败: {str(e)}")
+            return
+        
+        self.export_current_button.config(state=tk.DISABLED)
+        self.poll_current_export(future)
+    
+    def poll_current_export(self, future):
+        """定时检查当前图片是否导出完成"""
+        if not future.done():
+            self.root.after(50, self.poll_current_export, future)
+            return
+        
+        self.export_current_button.config(state=tk.NORMAL)
+        error = future.exception()
+        if error is None:
+            messagebox.showinfo("成功", "图片导出成功！")
+        else:
+            messagebox.showerror("错误", f"导出失败: {str(error)}")
     
     def export_all(self):
         """批量导出 - 修复版"""
@@ -950,62 +1622,129 @@ class CompleteWatermarkApp:
                 messagebox.showerror("错误", "为防止覆盖原图，不能导出到原文件夹！\n请选择其他文件夹。")
                 return
         
-        try:
-            success_count = 0
-            for image_info in self.loaded_images:
-                try:
-                    self.export_single_image(image_info, output_dir)
-                    success_count += 1
-                except Exception as e:
-                    print(f"导出 {image_info['name']} 失败: {e}")
-            
-            messagebox.showinfo("完成", f"成功导出 {success_count}/{len(self.loaded_images)} 张图片")
-        except Exception as e:
-            messagebox.showerror("错误", f"批量导出失败: {str(e)}")
+        # 水印在整批导出中不变，只需在主线程创建并旋转一次
+        watermark = self.create_export_watermark()
+        # 导出设置在循环前读取一次，每张图片不再重复读取Tk变量
+        position = _POS_TABLE.get(self.position.get(), WatermarkPosition.BOTTOM_RIGHT)
+        output_format = self.output_format.get().lower()
+        quality = self.jpeg_quality.get()
+        export_path = self.get_export_namer(output_dir, self.naming_option.get(),
+                                            self.custom_text.get(), output_format)
+        output_paths = _unique_paths(export_path(image_info) for image_info in self.loaded_images)
+        pairs = [(image_info['path'], output_path)
+                 for image_info, output_path in zip(self.loaded_images, output_paths)]
+        settings = (watermark, self.watermark_position, position, output_format, quality)
+        
+        # 各图片相互独立，在后台并行导出，界面保持响应
+        # 图片较少时启动子进程和传递水印的开销超过收益，直接使用线程池；
+        # 进程池按组提交，水印每组只需序列化传给子进程一次
+        futures = None
+        if len(pairs) >= self.EXPORT_PROCESS_MIN_JOBS:
+            chunk_size = self.EXPORT_CHUNK_SIZE
+            try:
+                if self._export_pool is None:
+                    # 使用spawn启动子进程：fork会复制正在运行渲染线程和线程池的Tk进程，
+                    # 若复制时某个线程持有锁，子进程可能死锁
+                    self._export_pool = ProcessPoolExecutor(
+                        max_workers=os.cpu_count(), mp_context=multiprocessing.get_context('spawn')
+                    )
+                futures = [self._export_pool.submit(_export_chunk, (pairs[i:i + chunk_size], *settings))
+                           for i in range(0, len(pairs), chunk_size)]
+            except (OSError, BrokenProcessPool) as e:
+                print(f"进程池不可用，改为线程池导出: {e}")
+                self._export_pool = None
+                futures = None
+        if futures is None:
+            # Pillow编解码时释放GIL，线程池同样可以利用多核
+            chunk_size = 1
+            futures = [self._thumb_pool.submit(_export_chunk, ([pair], *settings)) for pair in pairs]
+        
+        names = [image_info['name'] for image_info in self.loaded_images]
+        name_groups = [names[i:i + chunk_size] for i in range(0, len(names), chunk_size)]
+        
+        # 完成的任务由回调把图片数放入队列，主线程定时取出统计进度，无需每次检查全部任务
+        done_queue = queue.Queue()
+        for future, group in zip(futures, name_groups):
+            future.add_done_callback(lambda future, count=len(group): done_queue.put(count))
+        
+        self.export_all_button.config(text=f"导出中 0/{len(names)}", state=tk.DISABLED)
+        self.poll_export(futures, name_groups, done_queue, len(names))
     
-    def export_single_image(self, image_info, output_dir):
-        """导出单张图片"""
-        base_image = image_info['image'].copy()
+    def poll_export(self, futures, name_groups, done_queue, total, done_count=0):
+        """定时取出已完成的导出任务更新进度，全部完成后汇总结果"""
+        shown_count = done_count
+        while True:
+            try:
+                done_count += done_queue.get_nowait()
+            except queue.Empty:
+                break
+        
+        if done_count < total:
+            # 进度没有变化时不重设按钮文字，避免无谓的重绘
+            if done_count != shown_count:
+                self.export_all_button.config(text=f"导出中 {done_count}/{total}")
+            self.root.after(50, self.poll_export, futures, name_groups, done_queue, total, done_count)
+            return
         
-        # 创建水印
+        failures = []
+        for names, future in zip(name_groups, futures):
+            error = future.exception()
+            if error is not None:
+                # 整组任务失败（如子进程意外退出）
+                failures.extend(f"导出 {name} 失败: {error}" for name in names)
+                if isinstance(error, BrokenProcessPool):
+                    # 进程池已损坏，下次导出时重新创建
+                    self._export_pool = None
+            else:
+                failures.extend(f"导出 {name} 失败: {message}"
+                                for name, message in zip(names, future.result()) if message is not None)
+        if failures:
+            # 失败信息汇总后一次写出，大量失败时不逐行写控制台
+            print("\n".join(failures))
+        success_count = total - len(failures)
+        
+        self.export_all_button.config(text="批量导出", state=tk.NORMAL)
+        messagebox.showinfo("完成", f"成功导出 {success_count}/{total} 张图片")
+    
+    def create_export_watermark(self):
+        """按当前设置创建导出用的水印（已旋转），未设置水印时返回None"""
         watermark = None
         if self.watermark_type.get() == "text":
             watermark = self.create_text_watermark()
         elif self.watermark_type.get() == "image" and self.watermark_image_path.get():
             watermark = self.create_image_watermark()
         
-        # 应用水印
-        if watermark:
-            result_image = self.apply_watermark_to_image(base_image, watermark)
-        else:
-            result_image = base_image
-        
-        # 生成输出文件名
-        original_name = os.path.splitext(image_info['name'])[0]
-        output_format = self.output_format.get().lower()
-        
-        if self.naming_option.get() == "original":
-            output_name = f"{original_name}.{output_format}"
-        elif self.naming_option.get() == "prefix":
-            output_name = f"{self.custom_text.get()}{original_name}.{output_format}"
+        rotation_angle = self.rotation.get()
+        if watermark is not None and rotation_angle != 0:
+            watermark = self.watermark_processor.rotate_watermark(watermark, rotation_angle)
+        return watermark
+    
+    def get_export_namer(self, output_dir, naming_option, custom_text, output_format):
+        """
+        按命名规则返回生成导出文件路径的函数（设置由调用方传入）
+        命名规则只判断一次，批量导出时每张图片只需调用返回的函数
+        """
+        if naming_option == "original":
+            prefix, suffix = "", f".{output_format}"
+        elif naming_option == "prefix":
+            prefix, suffix = custom_text, f".{output_format}"
         else:  # suffix
-            output_name = f"{original_name}{self.custom_text.get()}.{output_format}"
+            prefix, suffix = "", f"{custom_text}.{output_format}"
         
-        output_path = os.path.join(output_dir, output_name)
-        
-        # 格式转换
-        if output_format == 'jpeg':
-            if result_image.mode == 'RGBA':
-                # 创建白色背景
-                background = Image.new('RGB', result_image.size, (255, 255, 255))
-                background.paste(result_image, mask=result_image.split()[-1])
-                result_image = background
-            
-            # 保存JPEG
-            result_image.save(output_path, 'JPEG', quality=self.jpeg_quality.get())
-        else:
-            # 保存PNG
-            result_image.save(output_path, 'PNG')
+        return lambda image_info: os.path.join(
+            output_dir, f"{prefix}{os.path.splitext(image_info['name'])[0]}{suffix}"
+        )
+    
+    def create_export_job(self, image_info, output_dir):
+        """按当前设置创建单张图片的导出任务（参数见_export_job）"""
+        watermark = self.create_export_watermark()
+        position = _POS_TABLE.get(self.position.get(), WatermarkPosition.BOTTOM_RIGHT)
+        output_format = self.output_format.get().lower()
+        output_path = self.get_export_namer(output_dir, self.naming_option.get(),
+                                            self.custom_text.get(), output_format)(image_info)
+        return (image_info['path'], output_path, watermark, self.watermark_position, position,
+                output_format, self.jpeg_quality.get())
+
     
     # 模板管理方法
     def save_template(self):
@@ -1094,7 +1833,8 @@ class CompleteWatermarkApp:
         ttk.Button(button_frame, text="取消", command=dialog.destroy).pack(side=tk.RIGHT, padx=5)
     
     def apply_template(self, template_data):
-        """应用模板"""
+        """应用模板（逐个设置变量期间不安排预览刷新，全部应用后只刷新一次）"""
+        self._preview_suspended = True
         try:
             # 应用模板数据
             self.watermark_type.set(template_data.get('watermark_type', 'text'))
@@ -1122,17 +1862,19 @@ class CompleteWatermarkApp:
             self.effect_color_button.config(bg=self.effect_color.get())
             self.on_type_change()
             self.on_format_change()
-            self.update_preview()
         except Exception as e:
             print(f"应用模板失败: {e}")
+        finally:
+            self._preview_suspended = False
+        self.schedule_preview_update()
     
     def load_templates(self):
         """从文件加载模板"""
         try:
             templates_file = os.path.join('templates', 'watermark_templates.json')
             if os.path.exists(templates_file):
-                with open(templates_file, 'r', encoding='utf-8') as f:
-                    self.templates = json.load(f)
+                with open(templates_file, 'rb') as f:
+                    self.templates = loads_json(f.read())
         except Exception as e:
             print(f"加载模板失败: {e}")
             self.templates = {}
@@ -1142,8 +1884,7 @@ class CompleteWatermarkApp:
         try:
             os.makedirs('templates', exist_ok=True)
             templates_file = os.path.join('templates', 'watermark_templates.json')
-            with open(templates_file, 'w', encoding='utf-8') as f:
-                json.dump(self.templates, f, ensure_ascii=False, indent=2)
+            atomic_write(templates_file, dumps_json(self.templates))
         except Exception as e:
             print(f"保存模板失败: {e}")
     
@@ -1152,9 +1893,9 @@ class CompleteWatermarkApp:
         try:
             settings_file = os.path.join('templates', 'last_settings.json')
             if os.path.exists(settings_file):
-                with open(settings_file, 'r', encoding='utf-8') as f:
-                    settings = json.load(f)
-                    self.apply_template(settings)
+                with open(settings_file, 'rb') as f:
+                    settings = loads_json(f.read())
+                self.apply_template(settings)
         except Exception as e:
             print(f"加载上次设置失败: {e}")
     
@@ -1185,8 +1926,7 @@ class CompleteWatermarkApp:
             
             os.makedirs('templates', exist_ok=True)
             settings_file = os.path.join('templates', 'last_settings.json')
-            with open(settings_file, 'w', encoding='utf-8') as f:
-                json.dump(settings, f, ensure_ascii=False, indent=2)
+            atomic_write(settings_file, dumps_json(settings))
         except Exception as e:
             print(f"保存当前设置失败: {e}")
     
@@ -1238,11 +1978,18 @@ class CompleteWatermarkApp:
 开发: CodeBuddy AI Assistant
 时间: 2025年9月"""
         
+        # 未安装pillow-simd时提示可用的加速方式
+        if not has_pillow_simd():
+            about_text += "\n\n提示: 安装 pillow-simd 可加快预览和导出"
+        
         messagebox.showinfo("关于", about_text)
     
     def on_closing(self):
         """程序关闭时的处理"""
         self.save_current_settings()
+        self._thumb_pool.shutdown(wait=False, cancel_futures=True)
+        if self._export_pool is not None:
+            self._export_pool.shutdown(wait=False, cancel_futures=True)
         self.root.destroy()
     
     def run(self):
@@ -1265,4 +2012,6 @@ def main():
         print(f"程序启动失败: {e}")
 
 if __name__ == "__main__":
+    # 打包为可执行文件后，进程池子进程需要此调用
+    multiprocessing.freeze_support()
     main()
\ No newline at end of file
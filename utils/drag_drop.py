@@ -3,6 +3,7 @@
 支持文件和文件夹的拖拽导入
 """
 
+import re
 import tkinter as tk
 from typing import Callable, Optional, List
 
@@ -71,7 +72,6 @@ class DragDropHandler:
             data = data[1:-1]
         
         # 分割多个文件路径
-        import re
         # 使用正则表达式分割路径，考虑空格和特殊字符
         paths = re.findall(r'[^\s]+(?:\s+[^\s]+)*', data)
         
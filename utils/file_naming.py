@@ -4,6 +4,7 @@
 """
 
 import os
+import time
 from typing import Optional, Dict, Any
 from enum import Enum
 
@@ -128,7 +129,6 @@ class FileNamingManager:
                 break
         
         # 如果还是冲突，使用时间戳
-        import time
         timestamp = int(time.time())
         new_name = f"{name_without_ext}_{timestamp}{ext}"
         return os.path.join(dir_path, new_name)
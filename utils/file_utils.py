@@ -2,12 +2,19 @@
 文件处理工具模块
 """
 
+import json
 import os
+import platform
 import shutil
+import time
 from pathlib import Path
 from typing import List, Optional, Tuple
 
 
+# 磁盘字体列表缓存
+FONT_INDEX_CACHE = os.path.join(os.path.expanduser('~'), '.cache', 'ImageWatermarker', 'fonts.json')
+
+
 def get_safe_filename(filename: str) -> str:
     """
     获取安全的文件名，移除或替换不安全字符
@@ -107,9 +114,8 @@ def format_file_size(size_bytes: int) -> str:
 def get_available_fonts() -> List[str]:
     """
     获取系统可用字体列表
+    结果缓存在磁盘上，字体目录未变化时无需重新扫描
     """
-    import platform
-    
     fonts = []
     system = platform.system()
     
@@ -132,21 +138,68 @@ def get_available_fonts() -> List[str]:
             os.path.expanduser("~/.local/share/fonts")
         ]
     
+    # 字体目录未变化时直接使用磁盘缓存的字体列表
+    cached = _load_font_index()
+    if cached is not None and _is_font_index_valid(cached, font_dirs):
+        return cached['fonts']
+    
     # 支持的字体格式
-    font_extensions = {'.ttf', '.otf', '.ttc'}
+    font_extensions = ('.ttf', '.otf', '.ttc')
+    # 记录扫描过的每个目录的修改时间，任一目录内容变化都会使缓存失效
+    dir_mtimes = {}
     
     for font_dir in font_dirs:
-        if os.path.exists(font_dir):
+        dir_mtimes[font_dir] = _get_dir_mtime(font_dir)
+        if dir_mtimes[font_dir]:
             try:
                 for root, dirs, files in os.walk(font_dir):
+                    dir_mtimes[root] = _get_dir_mtime(root)
                     for file in files:
-                        if Path(file).suffix.lower() in font_extensions:
+                        if file.lower().endswith(font_extensions):
                             font_path = os.path.join(root, file)
                             fonts.append(font_path)
             except PermissionError:
                 continue
     
-    return sorted(fonts)
+    fonts.sort()
+    _save_font_index({'dirs': dir_mtimes, 'fonts': fonts})
+    return fonts
+
+
+def _get_dir_mtime(path: str) -> int:
+    """获取目录修改时间（纳秒），目录不存在时返回0"""
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return 0
+
+
+def _is_font_index_valid(index: dict, font_dirs: List[str]) -> bool:
+    """缓存包含所有字体目录，且每个目录的修改时间都未变化"""
+    dir_mtimes = index['dirs']
+    return (all(d in dir_mtimes for d in font_dirs) and
+            all(_get_dir_mtime(d) == mtime for d, mtime in dir_mtimes.items()))
+
+
+def _load_font_index() -> Optional[dict]:
+    """读取磁盘缓存的字体列表"""
+    try:
+        with open(FONT_INDEX_CACHE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _save_font_index(index: dict):
+    """写入字体列表缓存（先写临时文件再替换）"""
+    try:
+        os.makedirs(os.path.dirname(FONT_INDEX_CACHE), exist_ok=True)
+        tmp_path = f"{FONT_INDEX_CACHE}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(index, f, ensure_ascii=False)
+        os.replace(tmp_path, FONT_INDEX_CACHE)
+    except OSError as e:
+        print(f"写入字体缓存失败: {e}")
 
 
 def get_font_name_from_path(font_path: str) -> str:
@@ -217,8 +270,6 @@ def clean_temp_files(temp_dir: str, max_age_hours: int = 24):
     清理临时文件
     """
     try:
-        import time
-        
         temp_path = Path(temp_dir)
         if not temp_path.exists():
             return
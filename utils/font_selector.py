@@ -5,11 +5,18 @@
 import tkinter as tk
 from tkinter import ttk, font as tkfont
 from typing import List, Optional, Callable, Tuple
+import functools
 import os
 import platform
 from PIL import ImageFont
 
 
+@functools.lru_cache(maxsize=32)
+def _get_font(font_path: str, size: int) -> ImageFont.FreeTypeFont:
+    """按(字体文件路径, 字号)缓存字体对象，避免重复打开和解析字体文件"""
+    return ImageFont.truetype(font_path, size)
+
+
 class FontSelector:
     """字体选择器"""
     
@@ -31,6 +38,9 @@ class FontSelector:
         # 回调函数
         self.font_change_callback: Optional[Callable] = None
         
+        # 字体族 -> 字体文件路径（查找需要遍历字体目录，结果缓存）
+        self._font_path_cache = {}
+        
         # 字体列表
         self.system_fonts = self.get_system_fonts()
         
@@ -215,7 +225,7 @@ class FontSelector:
             # 尝试加载系统字体
             font_path = self.find_font_file(family)
             if font_path:
-                return ImageFont.truetype(font_path, size)
+                return _get_font(font_path, size)
             else:
                 # 使用默认字体
                 return ImageFont.load_default()
@@ -225,7 +235,13 @@ class FontSelector:
             return ImageFont.load_default()
     
     def find_font_file(self, font_family: str) -> Optional[str]:
-        """查找字体文件路径"""
+        """查找字体文件路径（按字体族缓存查找结果）"""
+        if font_family not in self._font_path_cache:
+            self._font_path_cache[font_family] = self._search_font_file(font_family)
+        return self._font_path_cache[font_family]
+    
+    def _search_font_file(self, font_family: str) -> Optional[str]:
+        """遍历系统字体目录查找字体文件路径"""
         try:
             system = platform.system()
             
@@ -457,7 +473,7 @@ class FontManager:
                 # 尝试创建字体
                 font_path = self._find_font_file(family)
                 if font_path:
-                    font = ImageFont.truetype(font_path, size)
+                    font = _get_font(font_path, size)
                 else:
                     font = ImageFont.load_default()
                 
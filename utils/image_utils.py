@@ -2,12 +2,27 @@
 图像处理工具模块
 """
 
-from PIL import Image, ImageTk
+import PIL
+from PIL import Image, ImageTk, ImageFilter
 import tkinter as tk
 from typing import Tuple, Optional, Union
 import io
 import base64
 
+try:
+    import pyvips
+except (ImportError, OSError):  # pyvips为可选依赖，未安装pyvips或libvips时回退到PIL
+    pyvips = None
+
+
+# libvips波段数对应的PIL模式
+_VIPS_BANDS_TO_MODE = {1: 'L', 3: 'RGB', 4: 'RGBA'}
+
+
+def has_pillow_simd() -> bool:
+    """是否安装了pillow-simd（其版本号带有.postN后缀）"""
+    return '.post' in PIL.__version__
+
 
 def pil_to_tkinter(pil_image: Image.Image) -> ImageTk.PhotoImage:
     """
@@ -31,11 +46,18 @@ def pil_to_tkinter(pil_image: Image.Image) -> ImageTk.PhotoImage:
     return photo
 
 
-def resize_for_display(image: Image.Image, max_size: Tuple[int, int], 
+def resize_for_display(image: Union[str, Image.Image], max_size: Tuple[int, int], 
                       maintain_aspect: bool = True) -> Image.Image:
     """
     调整图像大小以适合显示区域
+    image为文件路径时，JPEG在解码时直接缩小到接近显示尺寸，无需解码完整图片
     """
+    if isinstance(image, str):
+        with Image.open(image) as source:
+            source.draft('RGB', (max_size[0] * 2, max_size[1] * 2))
+            image = source if source.mode in ('RGB', 'RGBA', 'L') else source.convert('RGB')
+            image.load()
+    
     if not maintain_aspect:
         return image.resize(max_size, Image.Resampling.LANCZOS)
     
@@ -55,10 +77,15 @@ def resize_for_display(image: Image.Image, max_size: Tuple[int, int],
         return image
     
     # 计算新尺寸
-    new_width = int(img_width * scale_ratio)
-    new_height = int(img_height * scale_ratio)
+    new_width = max(1, int(img_width * scale_ratio))
+    new_height = max(1, int(img_height * scale_ratio))
     
-    return image.resize((new_width, new_height), Image.Resampling.LANCZOS)
+    # 先按整数倍做盒式缩小（reduce），再把剩余的不到2倍缩放交给BILINEAR，仅用于显示
+    factor = min(img_width // new_width, img_height // new_height)
+    if factor >= 2:
+        image = image.reduce(factor)
+    
+    return image.resize((new_width, new_height), Image.Resampling.BILINEAR)
 
 
 def create_thumbnail_with_border(image: Image.Image, size: Tuple[int, int], 
@@ -147,12 +174,42 @@ def create_preview_image(base_image: Image.Image, watermark_image: Image.Image,
     return preview_base
 
 
+def fast_thumbnail(file_path: str, size: Tuple[int, int]) -> Image.Image:
+    """
+    从文件快速生成缩略图
+    安装了pyvips时使用libvips的解码时缩小（shrink-on-load），否则使用PIL的draft解码
+    """
+    if pyvips is not None:
+        try:
+            vips_image = pyvips.Image.thumbnail(file_path, size[0], height=size[1], size='down')
+            if vips_image.format != 'uchar':
+                vips_image = vips_image.cast('uchar')
+            mode = _VIPS_BANDS_TO_MODE.get(vips_image.bands)
+            if mode:
+                return Image.frombytes(mode, (vips_image.width, vips_image.height),
+                                       vips_image.write_to_memory())
+        except pyvips.Error as e:
+            print(f"pyvips生成缩略图失败，回退到PIL {file_path}: {e}")
+    
+    with Image.open(file_path) as image:
+        # JPEG在解码时直接缩小，无需解码完整图片
+        image.draft('RGB', (size[0] * 2, size[1] * 2))
+        image.thumbnail(size, Image.Resampling.BILINEAR)
+        thumbnail = image if image.mode in ('RGB', 'RGBA', 'L') else image.convert('RGB')
+        thumbnail.load()
+    return thumbnail
+
+
 def image_to_base64(image: Image.Image, format: str = 'PNG') -> str:
     """
     将PIL图像转换为base64字符串
     """
     buffer = io.BytesIO()
-    image.save(buffer, format=format)
+    if format.upper() == 'PNG':
+        # 内存中的临时数据，使用最低压缩级别以加快编码
+        image.save(buffer, format=format, compress_level=1)
+    else:
+        image.save(buffer, format=format)
     img_str = base64.b64encode(buffer.getvalue()).decode()
     return img_str
 
@@ -239,8 +296,6 @@ def add_drop_shadow(image: Image.Image, offset: Tuple[int, int] = (5, 5),
     为图像添加阴影效果
     """
     try:
-        from PIL import ImageFilter
-        
         # 确保图像有透明通道
         if image.mode != 'RGBA':
             image = image.convert('RGBA')
@@ -250,7 +305,7 @@ def add_drop_shadow(image: Image.Image, offset: Tuple[int, int] = (5, 5),
         shadow.paste(shadow_color, (0, 0, image.size[0], image.size[1]))
         
         # 使用原图的alpha通道作为阴影的mask
-        shadow.putalpha(image.split()[-1])
+        shadow.putalpha(image.getchannel('A'))
         
         # 模糊阴影
         if blur_radius > 0:
@@ -34,6 +34,7 @@ class ManualPositioningCanvas:
         
         # 水印相关
         self.watermark_item = None
+        self.watermark_label_item = None
         self.watermark_position = (0, 0)
         self.is_dragging = False
         self.drag_start = (0, 0)
@@ -107,6 +108,9 @@ class ManualPositioningCanvas:
     def show_placeholder(self):
         """显示占位符"""
         self.canvas.delete("all")
+        self.image_item = None
+        self.watermark_item = None
+        self.watermark_label_item = None
         
         # 绘制占位符
         center_x = self.canvas_width // 2
@@ -115,13 +119,13 @@ class ManualPositioningCanvas:
         self.canvas.create_rectangle(
             center_x - 100, center_y - 50,
             center_x + 100, center_y + 50,
-            outline='gray', fill='lightgray', dash=(5, 5)
+            outline='gray', fill='lightgray', dash=(5, 5), tags='placeholder'
         )
         
         self.canvas.create_text(
             center_x, center_y,
             text="请选择图片进行预览\n支持拖拽调整水印位置",
-            fill='gray', justify=tk.CENTER
+            fill='gray', justify=tk.CENTER, tags='placeholder'
         )
     
     def set_image(self, image: Image.Image):
@@ -140,8 +144,8 @@ class ManualPositioningCanvas:
             self.show_placeholder()
             return
         
-        # 清空画布
-        self.canvas.delete("all")
+        # 只移除占位符，图片和指示器的画布项保留复用
+        self.canvas.delete('placeholder')
         
         # 计算显示尺寸
         img_width, img_height = self.original_image.size
@@ -167,12 +171,16 @@ class ManualPositioningCanvas:
         image_x = canvas_center_x - display_width // 2 + self.image_offset[0]
         image_y = canvas_center_y - display_height // 2 + self.image_offset[1]
         
-        # 显示图片
-        self.image_item = self.canvas.create_image(
-            image_x, image_y,
-            anchor=tk.NW,
-            image=self.display_image
-        )
+        # 显示图片（图像项只创建一次，之后只更新图像和位置）
+        if self.image_item is None:
+            self.image_item = self.canvas.create_image(
+                image_x, image_y,
+                anchor=tk.NW,
+                image=self.display_image
+            )
+        else:
+            self.canvas.itemconfig(self.image_item, image=self.display_image)
+            self.canvas.coords(self.image_item, image_x, image_y)
         
         # 更新滚动区域
         self.canvas.configure(scrollregion=self.canvas.bbox("all"))
@@ -185,10 +193,6 @@ class ManualPositioningCanvas:
         if not self.original_image:
             return
         
-        # 删除旧的指示器
-        if self.watermark_item:
-            self.canvas.delete(self.watermark_item)
-        
         # 计算水印在画布上的位置
         img_width, img_height = self.original_image.size
         display_width = int(img_width * self.scale_factor)
@@ -204,19 +208,27 @@ class ManualPositioningCanvas:
         watermark_x = image_x + int(self.watermark_position[0] * self.scale_factor)
         watermark_y = image_y + int(self.watermark_position[1] * self.scale_factor)
         
-        # 绘制水印指示器
+        # 绘制水印指示器（指示器和标签只创建一次，拖动时只移动位置）
         indicator_size = 10
-        self.watermark_item = self.canvas.create_rectangle(
-            watermark_x - indicator_size, watermark_y - indicator_size,
-            watermark_x + indicator_size, watermark_y + indicator_size,
-            outline='red', width=2, dash=(3, 3)
-        )
-        
-        # 添加标签
-        self.canvas.create_text(
-            watermark_x, watermark_y - indicator_size - 10,
-            text="水印位置", fill='red', font=('Arial', 8)
-        )
+        if self.watermark_item is None:
+            self.watermark_item = self.canvas.create_rectangle(
+                watermark_x - indicator_size, watermark_y - indicator_size,
+                watermark_x + indicator_size, watermark_y + indicator_size,
+                outline='red', width=2, dash=(3, 3)
+            )
+            
+            # 添加标签
+            self.watermark_label_item = self.canvas.create_text(
+                watermark_x, watermark_y - indicator_size - 10,
+                text="水印位置", fill='red', font=('Arial', 8)
+            )
+        else:
+            self.canvas.coords(
+                self.watermark_item,
+                watermark_x - indicator_size, watermark_y - indicator_size,
+                watermark_x + indicator_size, watermark_y + indicator_size
+            )
+            self.canvas.coords(self.watermark_label_item, watermark_x, watermark_y - indicator_size - 10)
     
     def on_click(self, event):
         """鼠标点击事件"""
@@ -371,8 +383,6 @@ class ManualPositioningCanvas:
         """清空画布"""
         self.original_image = None
         self.display_image = None
-        self.image_item = None
-        self.watermark_item = None
         self.watermark_position = (0, 0)
         self.show_placeholder()
     
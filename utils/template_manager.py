@@ -5,6 +5,7 @@
 
 import tkinter as tk
 from tkinter import ttk, messagebox, simpledialog
+import copy
 import json
 import os
 from datetime import datetime
@@ -22,6 +23,7 @@ class TemplateManager:
             templates_dir: 模板存储目录
         """
         self.templates_dir = templates_dir
+        self._cache = {}  # 模板名称 -> (文件修改时间, 模板数据)
         self.ensure_templates_dir()
     
     def ensure_templates_dir(self):
@@ -50,6 +52,7 @@ class TemplateManager:
             
             # 保存到文件
             file_path = os.path.join(self.templates_dir, f"{name}.json")
+            self._cache.pop(name, None)
             with open(file_path, 'w', encoding='utf-8') as f:
                 json.dump(template_data, f, ensure_ascii=False, indent=2)
             
@@ -71,11 +74,22 @@ class TemplateManager:
         """
         try:
             file_path = os.path.join(self.templates_dir, f"{name}.json")
-            if not os.path.exists(file_path):
+            try:
+                mtime = os.stat(file_path).st_mtime_ns
+            except OSError:
+                self._cache.pop(name, None)
                 return None
             
+            # 文件未修改时直接使用缓存，重复加载同一模板无需重新读取和解析
+            # 返回副本，调用方修改返回值不会影响缓存
+            cached = self._cache.get(name)
+            if cached is not None and cached[0] == mtime:
+                return copy.deepcopy(cached[1])
+            
             with open(file_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
+                template_data = json.load(f)
+            self._cache[name] = (mtime, copy.deepcopy(template_data))
+            return template_data
                 
         except Exception as e:
             print(f"加载模板失败: {e}")
@@ -93,6 +107,7 @@ class TemplateManager:
         """
         try:
             file_path = os.path.join(self.templates_dir, f"{name}.json")
+            self._cache.pop(name, None)
             if os.path.exists(file_path):
                 os.remove(file_path)
                 return True
@@ -110,10 +125,10 @@ class TemplateManager:
             模板名称列表
         """
         try:
-            templates = []
-            for file in os.listdir(self.templates_dir):
-                if file.endswith('.json'):
-                    templates.append(os.path.splitext(file)[0])
+            # 目录项自带文件类型信息，过滤掉目录无需额外stat
+            with os.scandir(self.templates_dir) as entries:
+                templates = [entry.name[:-5] for entry in entries
+                             if entry.name.endswith('.json') and entry.is_file()]
             return sorted(templates)
             
         except Exception as e:
@@ -3,10 +3,119 @@
 """
 
 import os
+import threading
 from typing import Dict, Tuple, Optional
-from PIL import Image, ImageTk
+from PIL import Image, ImageTk, ImageDraw, ImageFont
 import hashlib
 
+from utils.image_utils import fast_thumbnail
+
+
+# 磁盘缩略图缓存目录
+THUMBNAIL_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'ImageWatermarker', 'thumbs')
+# 磁盘缓存大小上限，超出时按修改时间删除最旧的缩略图
+THUMBNAIL_CACHE_MAX_BYTES = 64 * 1024 * 1024
+# 每写入这么多个缩略图检查一次缓存大小（进程内第一次写入时也检查）
+_PRUNE_INTERVAL = 256
+
+_prune_lock = threading.Lock()
+_writes_since_prune = _PRUNE_INTERVAL
+
+
+def prune_thumbnail_cache(max_bytes: int = THUMBNAIL_CACHE_MAX_BYTES):
+    """
+    将磁盘缩略图缓存控制在max_bytes以内，从最久未使用的缩略图开始删除
+    命中缓存时会更新文件的修改时间，因此修改时间即最近使用时间
+    """
+    try:
+        entries = []
+        with os.scandir(THUMBNAIL_CACHE_DIR) as it:
+            for entry in it:
+                if entry.is_file() and entry.name.endswith('.png'):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+    except OSError:
+        return
+    
+    total = sum(size for _, size, _ in entries)
+    if total <= max_bytes:
+        return
+    
+    entries.sort()
+    for _, size, path in entries:
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total -= size
+        if total <= max_bytes:
+            break
+
+
+def _maybe_prune_thumbnail_cache():
+    """写入缩略图后按间隔检查缓存大小"""
+    global _writes_since_prune
+    with _prune_lock:
+        _writes_since_prune += 1
+        if _writes_since_prune < _PRUNE_INTERVAL:
+            return
+        _writes_since_prune = 0
+    prune_thumbnail_cache()
+
+
+def _thumbnail_cache_path(file_path: str, size: Tuple[int, int]) -> str:
+    """
+    根据文件头部64KB、修改时间和目标尺寸计算缓存文件路径
+    只读取文件头部，避免对整个文件求哈希
+    """
+    with open(file_path, 'rb') as f:
+        head = f.read(65536)
+    key = hashlib.sha1(head)
+    key.update(f"{os.path.getmtime(file_path)}_{size[0]}x{size[1]}".encode())
+    return os.path.join(THUMBNAIL_CACHE_DIR, key.hexdigest() + '.png')
+
+
+def load_cached_thumbnail(file_path: str, size: Tuple[int, int] = (64, 64)) -> Optional[Image.Image]:
+    """
+    获取图片文件的缩略图，优先从磁盘缓存读取
+    未命中时由fast_thumbnail生成缩略图并写入缓存
+    
+    Args:
+        file_path: 图片文件路径
+        size: 缩略图最大尺寸
+        
+    Returns:
+        缩略图，失败返回None
+    """
+    try:
+        cache_path = _thumbnail_cache_path(file_path, size)
+        if os.path.exists(cache_path):
+            with Image.open(cache_path) as cached:
+                cached.load()
+            try:
+                # 更新修改时间，清理缓存时最近用过的缩略图最后删除
+                os.utime(cache_path)
+            except OSError:
+                pass
+            return cached
+        
+        thumbnail = fast_thumbnail(file_path, size)
+        
+        try:
+            # 先写临时文件再替换，避免其他线程读到写了一半的缓存
+            os.makedirs(THUMBNAIL_CACHE_DIR, exist_ok=True)
+            tmp_path = f"{cache_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            thumbnail.save(tmp_path, 'PNG', compress_level=1)
+            os.replace(tmp_path, cache_path)
+            _maybe_prune_thumbnail_cache()
+        except OSError as e:
+            print(f"写入缩略图缓存失败 {cache_path}: {e}")
+        
+        return thumbnail
+    except Exception as e:
+        print(f"创建缩略图失败 {file_path}: {e}")
+        return None
+
 
 class ThumbnailManager:
     """缩略图管理器"""
@@ -185,6 +294,8 @@ class ThumbnailGenerator:
         """
         try:
             with Image.open(file_path) as image:
+                # JPEG在解码时直接缩小，复制时不再解码完整图片
+                image.draft('RGB', (size[0] * 2, size[1] * 2))
                 return ThumbnailGenerator.create_thumbnail(image, size)
         except Exception as e:
             print(f"创建缩略图失败 {file_path}: {e}")
@@ -202,8 +313,6 @@ class ThumbnailGenerator:
         Returns:
             占位符缩略图
         """
-        from PIL import ImageDraw, ImageFont
-        
         # 创建背景
         thumbnail = Image.new('RGB', size, (200, 200, 200))
         draw = ImageDraw.Draw(thumbnail)